@@ -0,0 +1,168 @@
+"""
+Benchmark the compiled activity tree against the interpreted activity tree.
+
+The single_run_process scenario is run with the activities registered with
+register_processes, which starts a process for every activity in every cycle, and
+compiled with compile_processes, which runs the tree of every vessel in a single
+process. The number of processed events, the number of started processes and the
+wall time are compared, after checking that both give the same logs.
+
+Run from the root of the repository with ``python -m benchmarks.compiled_activities``,
+which imports openclsim from the repository without installing it.
+"""
+import gc
+import time
+
+import shapely.geometry
+import simpy
+
+from openclsim import core, model
+
+SITE_CAPACITY = 200_000
+
+
+class CountingEnvironment(simpy.Environment):
+    """A simpy.Environment which counts the processed events and started processes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.nr_events = 0
+        self.nr_processes = 0
+
+    def process(self, generator):
+        self.nr_processes += 1
+        return super().process(generator)
+
+    def step(self):
+        self.nr_events += 1
+        return super().step()
+
+
+def build_scenario(nr_vessels):
+    """Return the environment, the objects and the WhileActivity of every vessel."""
+    env = CountingEnvironment()
+    registry = {}
+
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    TransportProcessingResource = type(
+        "TransportProcessingResource",
+        (
+            core.Identifiable,
+            core.Log,
+            core.ContainerDependentMovable,
+            core.Processor,
+            core.LoadingFunction,
+            core.UnloadingFunction,
+            core.HasResource,
+        ),
+        {},
+    )
+
+    location_from_site = shapely.geometry.Point(4.18055556, 52.18664444)
+    location_to_site = shapely.geometry.Point(4.25222222, 52.11428333)
+    from_site = Site(
+        env=env,
+        name="Winlocatie",
+        geometry=location_from_site,
+        capacity=SITE_CAPACITY,
+        level=SITE_CAPACITY,
+    )
+    to_site = Site(
+        env=env,
+        name="Dumplocatie",
+        geometry=location_to_site,
+        capacity=SITE_CAPACITY,
+        level=0,
+    )
+
+    objects = [from_site, to_site]
+    activities = []
+    for i in range(nr_vessels):
+        hopper = TransportProcessingResource(
+            env=env,
+            name=f"Hopper {i}",
+            geometry=location_from_site,
+            capacity=1000,
+            compute_v=lambda x: 10 + 2 * x,
+            loading_rate=1,
+            unloading_rate=5,
+        )
+        single_run, while_activity = model.single_run_process(
+            name=f"single_run {i}",
+            registry=registry,
+            env=env,
+            origin=from_site,
+            destination=to_site,
+            mover=hopper,
+            loader=hopper,
+            unloader=hopper,
+        )
+        objects += [hopper, while_activity, *single_run]
+        activities.append(while_activity)
+    return env, objects, activities
+
+
+def get_logs(objects):
+    """Return the logs of the objects, with the random activity ids replaced."""
+    names = {obj.id: obj.name for obj in objects}
+    logs = []
+    for obj in objects:
+        log = obj.log
+        logs.append(
+            (
+                log["Timestamp"],
+                [names.get(id_, id_) for id_ in log["ActivityID"]],
+                log["ActivityState"],
+                [
+                    {key: names.get(value, value) for key, value in label.items()}
+                    for label in log["ActivityLabel"]
+                ],
+            )
+        )
+    return logs
+
+
+def run(nr_vessels, register):
+    """Run the scenario and return the environment, the logs and the wall time."""
+    env, objects, activities = build_scenario(nr_vessels)
+    gc.collect()
+    start = time.perf_counter()
+    register(activities)
+    env.run()
+    duration = time.perf_counter() - start
+    return env, get_logs(objects), duration
+
+
+def main():
+    """Print the events, processes and wall time of both executions."""
+    print(
+        f"{'vessels':>8} {'execution':>12} {'events':>9} {'processes':>10} "
+        f"{'seconds':>8}"
+    )
+    for nr_vessels in [1, 4]:
+        results = {}
+        for execution, register in [
+            ("interpreted", model.register_processes),
+            ("compiled", model.compile_processes),
+        ]:
+            env, logs, duration = run(nr_vessels, register)
+            results[execution] = logs
+            print(
+                f"{nr_vessels:>8} {execution:>12} {env.nr_events:>9} "
+                f"{env.nr_processes:>10} {duration:>8.2f}"
+            )
+        assert results["interpreted"] == results["compiled"]
+
+
+if __name__ == "__main__":
+    main()
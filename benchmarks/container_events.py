@@ -0,0 +1,59 @@
+"""
+Benchmark the cost of a level change of an EventsContainer.
+
+A growing number of container events is registered on thresholds that are never
+crossed, after which the level is repeatedly changed around a few thresholds that
+are crossed in every cycle. The cost per level change should stay flat when the
+number of registered thresholds grows.
+
+Run from the root of the repository with ``python -m benchmarks.container_events``,
+which imports openclsim from the repository without installing it.
+"""
+import gc
+import time
+
+import simpy
+
+from openclsim import core
+
+CYCLES = 2_000
+
+
+def time_level_changes(nr_thresholds):
+    """Return the average time in microseconds of a put or get on the container."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env)
+    container.initialize_container(
+        [{"id": "default", "capacity": 2 * nr_thresholds + 10, "level": 5}]
+    )
+
+    # thresholds which are never reached during the benchmark
+    for i in range(nr_thresholds):
+        container.get_container_event(level=10 + i, operator="ge")
+
+    def process():
+        for _ in range(CYCLES):
+            container.get_container_event(level=6, operator="ge")
+            yield from container.put(2)
+            container.get_container_event(level=4, operator="le")
+            yield from container.get(2)
+
+    env.process(process())
+    gc.collect()
+    start = time.perf_counter()
+    env.run()
+    duration = time.perf_counter() - start
+
+    return duration / (2 * CYCLES) * 1e6, len(container._container_events)
+
+
+def main():
+    """Print the cost of a level change for a growing number of thresholds."""
+    print(f"{'thresholds':>12} {'us / level change':>18} {'stored events':>14}")
+    for nr_thresholds in [10, 100, 1_000, 10_000, 100_000]:
+        cost, stored = time_level_changes(nr_thresholds)
+        print(f"{nr_thresholds:>12} {cost:>18.2f} {stored:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark the memory use of the activities and their logs.
+
+A large number of BasicActivity objects is created, after which every activity
+logs a START and STOP entry. The memory allocated per activity is measured with
+tracemalloc after creation and after logging, once with the layout of the log
+before the memory reduction and once with the current layout, and the memory per
+log entry is measured by logging many entries to a single object.
+
+Run from the root of the repository with ``python -m benchmarks.memory``,
+which imports openclsim from the repository without installing it.
+"""
+import gc
+import tracemalloc
+
+import numpy as np
+import simpy
+
+from openclsim import core, model
+from openclsim.core.log_backend import CodeTable, GrowableArray
+
+NR_ACTIVITIES = 10_000
+NR_ENTRIES = 100_000
+
+
+def measure(function):
+    """Return the result of function and the memory it allocated, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+class BaselineCodeTable(CodeTable):
+    """A CodeTable with an instance __dict__, as before its __slots__."""
+
+
+class BaselineGrowableArray(GrowableArray):
+    """A GrowableArray which allocates its buffer right away, with a __dict__."""
+
+    def __init__(self, dtype, capacity=16):
+        super().__init__(dtype, capacity)
+        self._data = np.empty(capacity, dtype=dtype)
+
+
+class BaselineLogBackend(core.ColumnarLogBackend):
+    """
+    The layout of the ColumnarLogBackend before the memory reduction.
+
+    The backend and its tables and buffers have an instance __dict__, the buffers
+    of 16 elements are allocated when the backend is created and every backend
+    has a state table of its own.
+    """
+
+    def __init__(self, capacity=16):
+        super().__init__(capacity)
+        self.timestamps = BaselineGrowableArray(np.float64, capacity)
+        self.activity_ids = BaselineGrowableArray(np.int32, capacity)
+        self.activity_states = BaselineGrowableArray(np.int8, capacity)
+        self.activity_labels = BaselineGrowableArray(np.int32, capacity)
+        self.object_state_codes = BaselineGrowableArray(np.int32, capacity)
+        self.id_table = BaselineCodeTable()
+        self.state_table = BaselineCodeTable()
+        self.label_table = BaselineCodeTable()
+        self.label_table.code(())
+
+
+def create_activities(env, log_backend):
+    """Return NR_ACTIVITIES basic activities."""
+    registry = {}
+    return [
+        model.BasicActivity(
+            env=env,
+            name=f"activity {i}",
+            registry=registry,
+            duration=1,
+            log_backend=log_backend,
+        )
+        for i in range(NR_ACTIVITIES)
+    ]
+
+
+def log_activities(activities, get_label):
+    """Log a START and STOP entry for every activity, as a run would."""
+    for activity in activities:
+        for state in [core.LogState.START, core.LogState.STOP]:
+            activity.log_entry(
+                t=0,
+                activity_id=activity.id,
+                activity_state=state,
+                activity_label=get_label("subprocess", activity.id),
+            )
+
+
+def log_entries(log_backend):
+    """Return a Log object with NR_ENTRIES entries, stored in log_backend."""
+    log = core.Log(env=simpy.Environment(), log_backend=log_backend)
+    labels = [core.ActivityLabel("subprocess", f"activity {i}") for i in range(10)]
+    for i in range(NR_ENTRIES):
+        log.log_entry(
+            t=i,
+            activity_id="activity",
+            activity_state=core.LogState.START,
+            activity_label=labels[i % 10],
+        )
+    return log
+
+
+def dict_label(type_, ref):
+    """Return the activity label as the dictionary which was logged before."""
+    return {"type": type_, "ref": ref}
+
+
+def main():
+    """Print the memory per activity and per log entry."""
+    print(f"{'bytes/activity':>24} {'created':>9} {'logged':>9}")
+    results = {}
+    for name, log_backend, get_label in [
+        ("before", BaselineLogBackend, dict_label),
+        ("after", core.ColumnarLogBackend, core.ActivityLabel),
+    ]:
+        env = simpy.Environment()
+        activities, created = measure(lambda: create_activities(env, log_backend))
+        _, logged = measure(lambda: log_activities(activities, get_label))
+        results[name] = (created + logged) / NR_ACTIVITIES
+        print(f"{name:>24} {created / NR_ACTIVITIES:>9.0f} {results[name]:>9.0f}")
+    reduction = 1 - results["after"] / results["before"]
+    print(f"{'reduction':>24} {'':>9} {reduction:>9.0%}")
+
+    print(f"\n{'log backend':>24} {'bytes/entry':>11}")
+    for name, log_backend in [
+        ("DictLogBackend", core.DictLogBackend),
+        ("ColumnarLogBackend", core.ColumnarLogBackend),
+    ]:
+        _, size = measure(lambda: log_entries(log_backend))
+        print(f"{name:>24} {size / NR_ENTRIES:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
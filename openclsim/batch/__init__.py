@@ -0,0 +1,23 @@
+"""Directory for running batches of simulations."""
+
+from .ensemble import get_run_summary, run_ensemble, run_member
+from .sweep import (
+    ResultCache,
+    get_input_hash,
+    get_parameter_grid,
+    log_progress,
+    run_point,
+    run_sweep,
+)
+
+__all__ = [
+    "get_run_summary",
+    "run_ensemble",
+    "run_member",
+    "ResultCache",
+    "get_input_hash",
+    "get_parameter_grid",
+    "log_progress",
+    "run_point",
+    "run_sweep",
+]
@@ -0,0 +1,110 @@
+"""Monte Carlo ensembles of simulation runs."""
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def get_run_summary(env, simulation_objects):
+    """
+    Get a compact summary of a simulation run.
+
+    The summary contains one row per simulation object with the first and last
+    timestamp of its log and its number of log entries.
+    """
+    rows = []
+    for simulation_object in simulation_objects:
+        timestamps = simulation_object.log["Timestamp"]
+        rows.append(
+            {
+                "Object": getattr(simulation_object, "name", None),
+                "ObjectID": getattr(simulation_object, "id", None),
+                "Start": min(timestamps) if timestamps else None,
+                "Stop": max(timestamps) if timestamps else None,
+                "Entries": len(timestamps),
+            }
+        )
+    return pd.DataFrame(
+        rows, columns=["Object", "ObjectID", "Start", "Stop", "Entries"]
+    ).assign(SimulationTime=env.now)
+
+
+def run_member(build_scenario, seed, summarize=get_run_summary, until=None):
+    """
+    Build, run and summarize a single member of an ensemble.
+
+    The random and numpy.random generators are seeded with the seed before the
+    scenario is built, such that the run can be reproduced.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
+    env, simulation_objects = build_scenario(seed)
+    env.run(until=until)
+    return summarize(env, simulation_objects)
+
+
+def _run_member(arguments):
+    return run_member(*arguments)
+
+
+def run_ensemble(
+    build_scenario,
+    seeds,
+    summarize=get_run_summary,
+    until=None,
+    max_workers=None,
+    chunksize=1,
+):
+    """
+    Run a Monte Carlo ensemble of a scenario over a process pool.
+
+    Every run builds its own simpy environment, sites, vessels and activities in a
+    worker process, so the runs are independent and the ensemble scales with the
+    number of cores. Only the compact result table of every run is sent back to the
+    parent process.
+
+    Parameters
+    ----------
+    build_scenario
+        Callable taking a seed and returning the simpy environment and a list of
+        the simulation objects to summarize. The callable is sent to the worker
+        processes, so it must be picklable, e.g. a function defined at the top
+        level of a module.
+    seeds
+        Iterable of seeds, one for every run of the ensemble
+    summarize
+        Callable taking the environment and the simulation objects after the run
+        and returning a pandas DataFrame, by default get_run_summary
+    until
+        Passed to env.run, by default the runs continue until no events are left
+    max_workers
+        Number of worker processes, by default the number of cores. With
+        max_workers=1 the runs are executed in the current process.
+    chunksize
+        Number of runs which are sent to a worker process at once
+
+    Returns
+    -------
+    pandas.DataFrame
+        The concatenated result tables of the runs, with the seed of the run in
+        the Seed column
+    """
+    seeds = list(seeds)
+    arguments = [(build_scenario, seed, summarize, until) for seed in seeds]
+
+    if max_workers == 1:
+        results = map(_run_member, arguments)
+        return _concat_results(seeds, results)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_run_member, arguments, chunksize=chunksize)
+        return _concat_results(seeds, results)
+
+
+def _concat_results(seeds, results):
+    tables = [result.assign(Seed=seed) for seed, result in zip(seeds, results)]
+    if not tables:
+        return pd.DataFrame()
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,227 @@
+"""Parameter sweeps of simulation runs with on-disk caching of the results."""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from .ensemble import get_run_summary
+
+logger = logging.getLogger(__name__)
+
+
+def get_parameter_grid(parameters):
+    """
+    Get all the combinations of a grid of parameters.
+
+    Parameters
+    ----------
+    parameters : dict
+        Dictionary of the parameter names to the list of values to sweep
+
+    Returns
+    -------
+    list
+        One dictionary of parameter names to values for every combination
+    """
+    names = list(parameters)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(parameters[name] for name in names))
+    ]
+
+
+def _get_qualified_name(function):
+    return f"{function.__module__}.{function.__qualname__}"
+
+
+def get_input_hash(build_scenario, parameters, summarize=get_run_summary, until=None):
+    """
+    Hash the scenario builder, its parameters, the summary function and the horizon.
+
+    The parameters must be serializable to JSON, so that equal parameters give the
+    same hash in every process.
+
+    Raises
+    ------
+    TypeError
+        If a parameter can not be serialized to JSON
+    """
+    inputs = {
+        "scenario": _get_qualified_name(build_scenario),
+        "parameters": parameters,
+        "summarize": _get_qualified_name(summarize),
+        "until": until,
+    }
+    try:
+        inputs = json.dumps(inputs, sort_keys=True)
+    except TypeError as error:
+        raise TypeError(
+            f"The parameters {parameters} can not be hashed, since they can not be serialized to JSON: {error}"
+        ) from error
+    return hashlib.sha256(inputs.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Results of simulation runs stored on disk, one pickle file per input hash.
+
+    The results are written to a temporary file which is moved into place, so an
+    interrupted sweep never leaves a partial result behind.
+
+    Parameters
+    ----------
+    directory
+        Directory in which the results are stored, created if it does not exist
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key):
+        return self.directory / f"{key}.pkl"
+
+    def __contains__(self, key):
+        """Return whether the result of an input hash is stored."""
+        return self.path(key).exists()
+
+    def load(self, key):
+        with open(self.path(key), "rb") as f:
+            return pickle.load(f)
+
+    def store(self, key, result):
+        path = self.path(key)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary, "wb") as f:
+            pickle.dump(result, f)
+        os.replace(temporary, path)
+
+
+def run_point(build_scenario, parameters, summarize=get_run_summary, until=None):
+    """Build, run and summarize the scenario of a single set of parameters."""
+    env, simulation_objects = build_scenario(**parameters)
+    env.run(until=until)
+    return summarize(env, simulation_objects)
+
+
+def _run_point(arguments):
+    return run_point(*arguments)
+
+
+def log_progress(done, total, throughput):
+    """Log the progress and the throughput of a sweep."""
+    logger.info(f"Sweep: {done}/{total} runs done, {throughput:.2f} runs/s")
+
+
+def run_sweep(
+    build_scenario,
+    parameters,
+    cache_dir,
+    summarize=get_run_summary,
+    until=None,
+    max_workers=None,
+    progress=log_progress,
+):
+    """
+    Run a scenario for all the combinations of a grid of parameters.
+
+    Every combination is identified by a hash of the scenario builder, its
+    parameters, the summary function and until. The result of every completed run
+    is stored in the cache directory as soon as it is received, and combinations
+    whose result is already stored are not run again. Extending a sweep or
+    rerunning it after a crash therefore only executes the new combinations. A run
+    which raises does not stop the sweep: the other runs are completed and stored,
+    after which a RuntimeError is raised for the failed combinations.
+
+    Parameters
+    ----------
+    build_scenario
+        Callable taking the parameters as keyword arguments and returning the simpy
+        environment and a list of the simulation objects to summarize. The
+        callable is sent to the worker processes, so it must be picklable.
+    parameters : dict or list
+        Dictionary of the parameter names to the list of values to sweep, or a list
+        of dictionaries of parameter names to values. The values must be
+        serializable to JSON.
+    cache_dir
+        Directory in which the results are stored
+    summarize
+        Callable taking the environment and the simulation objects after the run
+        and returning a pandas DataFrame, by default get_run_summary
+    until
+        Passed to env.run, by default the runs continue until no events are left
+    max_workers
+        Number of worker processes, by default the number of cores. With
+        max_workers=1 the runs are executed in the current process.
+    progress
+        Callable receiving the number of completed runs, the total number of runs
+        and the throughput in runs per second after every run, or None
+
+    Returns
+    -------
+    pandas.DataFrame
+        The concatenated result tables of all the combinations, with a column for
+        every parameter
+
+    Raises
+    ------
+    RuntimeError
+        If one or more runs raised, after all the other runs are stored
+    """
+    if isinstance(parameters, dict):
+        points = get_parameter_grid(parameters)
+    else:
+        points = list(parameters)
+
+    cache = ResultCache(cache_dir)
+    keys = [get_input_hash(build_scenario, point, summarize, until) for point in points]
+    pending = {key: point for key, point in zip(keys, points) if key not in cache}
+
+    start = time.perf_counter()
+    total = len(pending)
+
+    def completed(done):
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            progress(done, total, done / elapsed if elapsed > 0 else float("inf"))
+
+    failures = {}
+    if max_workers == 1:
+        for done, (key, point) in enumerate(pending.items(), start=1):
+            try:
+                cache.store(key, run_point(build_scenario, point, summarize, until))
+            except Exception as error:
+                failures[key] = error
+            completed(done)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _run_point, (build_scenario, point, summarize, until)
+                ): key
+                for key, point in pending.items()
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                if future.exception() is None:
+                    cache.store(futures[future], future.result())
+                else:
+                    failures[futures[future]] = future.exception()
+                completed(done)
+
+    if failures:
+        failed = [pending[key] for key in failures]
+        raise RuntimeError(
+            f"{len(failures)} of {total} runs of the sweep failed, for the parameters {failed}"
+        ) from next(iter(failures.values()))
+
+    tables = [cache.load(key).assign(**point) for key, point in zip(keys, points)]
+    if not tables:
+        return pd.DataFrame()
+    return pd.concat(tables, ignore_index=True)
@@ -1,10 +1,25 @@
 """Core of the simulation Package."""
 
 from .container import HasContainer, HasMultiContainer
+from .distance import (
+    DistanceCache,
+    DistanceMatrix,
+    GeodesicDistance,
+    HaversineDistance,
+    distance_cache,
+)
 from .events_container import EventsContainer
 from .identifiable import Identifiable
 from .locatable import Locatable
-from .log import Log, LogState
+from .log import ActivityLabel, Log, LogState
+from .log_backend import (
+    ColumnarLogBackend,
+    DictLogBackend,
+    LogBackend,
+    StreamingLogBackend,
+    read_log,
+    read_log_batches,
+)
 from .movable import ContainerDependentMovable, Movable, MultiContainerDependentMovable
 from .processor import LoadingFunction, Processor, UnloadingFunction
 from .resource import HasResource
@@ -14,11 +29,23 @@ __all__ = [
     "basic",
     "HasContainer",
     "HasMultiContainer",
+    "DistanceCache",
+    "DistanceMatrix",
+    "distance_cache",
+    "GeodesicDistance",
+    "HaversineDistance",
     "EventsContainer",
     "Identifiable",
     "Locatable",
+    "ActivityLabel",
     "Log",
     "LogState",
+    "LogBackend",
+    "ColumnarLogBackend",
+    "DictLogBackend",
+    "StreamingLogBackend",
+    "read_log",
+    "read_log_batches",
     "Movable",
     "ContainerDependentMovable",
     "MultiContainerDependentMovable",
@@ -47,6 +47,12 @@ class HasContainer(SimpyObject):
         state.update({"container level": self.container.get_level()})
         return state
 
+    def get_state_version(self):
+        version = ()
+        if hasattr(super(), "get_state_version"):
+            version = super().get_state_version()
+        return version + (self.container.version,)
+
 
 class HasMultiContainer(HasContainer):
     """
@@ -75,3 +81,7 @@ class HasMultiContainer(HasContainer):
         )
 
         return state
+
+    def get_state_version(self):
+        # the levels of all the container ids share the version of the container
+        return super().get_state_version()
@@ -0,0 +1,197 @@
+"""Cached distances between the locations of the simulation objecs."""
+from collections import OrderedDict
+
+import numpy as np
+import pyproj
+import shapely.geometry
+
+# A single geodesic engine shared by all the simulation objects
+wgs84 = pyproj.Geod(ellps="WGS84")
+
+
+def get_coordinates(geometry):
+    """Return the (lon, lat) of a point geometry, either shapely or geojson."""
+    if not isinstance(geometry, shapely.geometry.Point):
+        geometry = shapely.geometry.asShape(geometry)
+    return geometry.x, geometry.y
+
+
+class GeodesicDistance:
+    """
+    Geodesic distance in meters over an ellipsoid, computed with pyproj.
+
+    The coordinates can be scalars or arrays.
+
+    Parameters
+    ----------
+    geod
+        The pyproj.Geod to use, by default the shared WGS84 ellipsoid
+    """
+
+    def __init__(self, geod=None):
+        self.geod = wgs84 if geod is None else geod
+
+    def __call__(self, lon1, lat1, lon2, lat2):
+        _, _, distance = self.geod.inv(lon1, lat1, lon2, lat2)
+        return distance
+
+
+class HaversineDistance:
+    """
+    Great circle distance in meters over a sphere.
+
+    A cheaper alternative for GeodesicDistance for scenarios where the precision of
+    the ellipsoid is not required. The coordinates can be scalars or arrays.
+
+    Parameters
+    ----------
+    radius : meters
+        Radius of the sphere, by default the mean radius of the earth
+    """
+
+    def __init__(self, radius: float = 6_371_008.8):
+        self.radius = radius
+
+    def __call__(self, lon1, lat1, lon2, lat2):
+        lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        )
+        return 2 * self.radius * np.arcsin(np.sqrt(a))
+
+
+class DistanceCache:
+    """
+    Bounded cache of the distances between pairs of coordinates.
+
+    Sites do not move and vessels shuttle between the same few locations, so most
+    distances are requested many times. The coordinates are rounded to form the key
+    of the cache and the least recently used distance is evicted first.
+
+    Parameters
+    ----------
+    model
+        Callable returning the distance between (lon1, lat1, lon2, lat2), by
+        default the GeodesicDistance over the WGS84 ellipsoid
+    maxsize
+        Maximum number of distances which are cached
+    precision
+        Number of decimals of the coordinates (in degrees) used in the key
+    """
+
+    def __init__(self, model=None, maxsize: int = 10_000, precision: int = 7):
+        self.model = GeodesicDistance() if model is None else model
+        self.maxsize = maxsize
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self._distances = OrderedDict()
+
+    def distance(self, origin, destination):
+        """Return the distance in meters between two (lon, lat) coordinates."""
+        key = (
+            round(origin[0], self.precision),
+            round(origin[1], self.precision),
+            round(destination[0], self.precision),
+            round(destination[1], self.precision),
+        )
+
+        distance = self._distances.get(key)
+        if distance is not None:
+            self.hits += 1
+            self._distances.move_to_end(key)
+            return distance
+
+        self.misses += 1
+        distance = self.model(origin[0], origin[1], destination[0], destination[1])
+        self._distances[key] = distance
+        if len(self._distances) > self.maxsize:
+            self._distances.popitem(last=False)
+        return distance
+
+    def set_model(self, model):
+        """Use another distance model, which clears the cached distances."""
+        self.model = model
+        self.clear()
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self._distances.clear()
+
+    def __len__(self):
+        """Return the number of cached distances."""
+        return len(self._distances)
+
+
+distance_cache = DistanceCache()
+
+
+class DistanceMatrix:
+    """
+    Pairwise distances between a fixed set of sites.
+
+    All the distances are computed in one vectorized call of the distance model, after
+    which the distance between two sites, or between their geometries, is resolved by
+    index. A DistanceMatrix can be passed to a Movable to resolve its sailing distances.
+
+    Parameters
+    ----------
+    sites
+        List of Locatable objects with a point geometry
+    model
+        Callable returning the distances between arrays of (lon1, lat1, lon2, lat2),
+        by default the model of the distance_cache
+    precision
+        Number of decimals of the coordinates (in degrees) used to match geometries
+    """
+
+    def __init__(self, sites, model=None, precision: int = 7):
+        self.sites = list(sites)
+        self.precision = precision
+        self.index = {site: i for i, site in enumerate(self.sites)}
+
+        coordinates = np.array(
+            [get_coordinates(site.geometry) for site in self.sites], dtype=float
+        ).reshape(-1, 2)
+        self.coordinate_index = {
+            self._key(lon, lat): i for i, (lon, lat) in enumerate(coordinates)
+        }
+
+        nr_sites = len(self.sites)
+        lons, lats = coordinates[:, 0], coordinates[:, 1]
+        model = distance_cache.model if model is None else model
+        self.matrix = np.asarray(
+            model(
+                np.repeat(lons, nr_sites),
+                np.repeat(lats, nr_sites),
+                np.tile(lons, nr_sites),
+                np.tile(lats, nr_sites),
+            ),
+            dtype=float,
+        ).reshape(nr_sites, nr_sites)
+
+    def _key(self, lon, lat):
+        return round(lon, self.precision), round(lat, self.precision)
+
+    def distance(self, origin, destination):
+        """Return the distance in meters between two sites of the matrix."""
+        return self.matrix[self.index[origin], self.index[destination]]
+
+    def get_distance(self, origin, destination):
+        """
+        Return the distance in meters between two geometries.
+
+        None is returned if one of the geometries is not at a site of the matrix.
+        """
+        i = self.coordinate_index.get(self._key(*get_coordinates(origin)))
+        j = self.coordinate_index.get(self._key(*get_coordinates(destination)))
+        if i is None or j is None:
+            return None
+        return self.matrix[i, j]
+
+    def unreachable(self, max_distance: float = np.inf):
+        """Return the pairs of sites without a finite distance below max_distance."""
+        i, j = np.nonzero(~(self.matrix <= max_distance))
+        return [(self.sites[a], self.sites[b]) for a, b in zip(i, j)]
@@ -1,14 +1,76 @@
 """EventsContainer provide a basic class for managing information which has to be stored in an object."""
+import bisect
+import itertools
 import operator as py_opp
 
-import simpy
+
+class ThresholdIndex:
+    """
+    Sorted thresholds of the pending container events of a single container id.
+
+    The thresholds of the 'ge' and 'gt' events are kept in a rising list and those
+    of the 'le' and 'lt' events in a falling list. Both lists are ordered such that
+    the thresholds closest to the current level are at the end, so a change of the
+    level only touches the thresholds which are actually crossed.
+    """
+
+    def __init__(self):
+        self.rising = []
+        self.falling = []
+
+    def add(self, level, operator, sequence):
+        if operator in ["ge", "gt"]:
+            bisect.insort(self.rising, (-level, -int(operator == "gt"), sequence))
+        else:
+            bisect.insort(self.falling, (level, int(operator == "le"), sequence))
+
+    def pop_crossed(self, level):
+        """Remove and return the (level, operator, sequence) of all crossed thresholds."""
+        i = bisect.bisect_right(self.rising, (-level, -1, float("inf")))
+        j = bisect.bisect_right(self.falling, (level, 0, float("inf")))
+
+        crossed = [
+            (-lvl, "gt" if strict else "ge", seq)
+            for lvl, strict, seq in self.rising[i:]
+        ]
+        crossed += [
+            (lvl, "le" if equal else "lt", seq) for lvl, equal, seq in self.falling[j:]
+        ]
+
+        del self.rising[i:]
+        del self.falling[j:]
+        return crossed
+
+    def crossed_by(self, low, high):
+        """Return whether a level between low and high would trigger a pending event."""
+        if self.rising:
+            level, strict, _ = self.rising[-1]
+            if high > -level or (high == -level and not strict):
+                return True
+        if self.falling:
+            level, equal, _ = self.falling[-1]
+            if low < level or (low == level and equal):
+                return True
+        return False
+
+    def __len__(self):
+        """Return the number of pending thresholds."""
+        return len(self.rising) + len(self.falling)
 
 
-class EventsContainer(simpy.FilterStore):
+class EventsContainer:
     """
     EventsContainer provide a basic class for managing information which has to be stored in an object.
 
     It is a generic container, which has a default behavior, but can be used for storing arbitrary objects.
+    The levels and capacities are kept in dictionaries keyed by the container id, so that
+    every container can be accessed in constant time. The pending container events are
+    kept in a ThresholdIndex per container id, and triggered events are evicted as soon
+    as they have been processed by the simpy environment.
+
+    The minimum and maximum level of every container id are recorded in level_ranges
+    while it is a dictionary, which is used to fast-forward identical cycles. The
+    version is incremented on every change of a level.
 
     Parameters
     ----------
@@ -17,9 +79,17 @@ class EventsContainer(simpy.FilterStore):
     """
 
     def __init__(self, env, store_capacity: int = 1, *args, **kwargs):
-        super().__init__(env, capacity=store_capacity * 2)
         self._env = env
+        self.store_capacity = store_capacity
+        self._levels = {}
+        self._capacities = {}
         self._container_events = {}
+        self._event_sequence = {}
+        self._sequence = itertools.count()
+        self._thresholds = {}
+        self._changed_ids = set()
+        self.level_ranges = None
+        self.version = 0
 
     def initialize_container(self, initials):
         """Initialize method used for MultiContainers."""
@@ -29,44 +99,33 @@ class EventsContainer(simpy.FilterStore):
             assert "capacity" in item
             assert "level" in item
             assert not item["id"].endswith("_reservations")
+            assert (
+                item["id"] in self._levels
+                or len(self.container_list) < self.store_capacity
+            ), f"The store capacity ({self.store_capacity}) of the container is exceeded."
 
-            container_item = {
-                "id": item["id"],
-                "capacity": item["capacity"],
-                "level": item["level"],
-            }
-            reservation_item = {
-                "id": f"{item['id']}_reservations",
-                "capacity": item["capacity"],
-                "level": item["level"],
-            }
-
-            super().put(container_item)
-            super().put(reservation_item)
+            for id_ in [item["id"], f"{item['id']}_reservations"]:
+                self._capacities[id_] = item["capacity"]
+                self._levels[id_] = item["level"]
+                self._changed_ids.add(id_)
+        self.version += 1
 
     @property
-    def container_list(self):
+    def items(self):
         return [
-            item["id"]
-            for item in self.items
-            if not item["id"].endswith("_reservations")
+            {"id": id_, "capacity": self._capacities[id_], "level": level}
+            for id_, level in self._levels.items()
         ]
 
+    @property
+    def container_list(self):
+        return [id_ for id_ in self._levels if not id_.endswith("_reservations")]
+
     def get_capacity(self, id_="default"):
-        if self.items is None:
-            return 0
-        res = [item["capacity"] for item in self.items if item["id"] == id_]
-        if isinstance(res, list) and len(res) > 0:
-            return res[0]
-        return 0
+        return self._capacities.get(id_, 0)
 
     def get_level(self, id_="default"):
-        if self.items is None:
-            return 0
-        res = [item["level"] for item in self.items if item["id"] == id_]
-        if isinstance(res, list) and len(res) > 0:
-            return res[0]
-        return 0
+        return self._levels.get(id_, 0)
 
     def get_container_event(self, level, operator, id_="default"):
         assert operator in [
@@ -76,18 +135,27 @@ class EventsContainer(simpy.FilterStore):
             "le",
         ], f"Chosen operator ({operator}) is not supported please choose from: 'gt', 'ge', 'lt', 'le'"
 
-        self._container_events.setdefault((id_, level, operator), self._env.event())
+        self.update_container_events()
 
-        event = self._container_events.get((id_, level, operator))
+        key = (id_, level, operator)
+        event = self._container_events.get(key)
         current_level = self.get_level(id_)
         event_status = getattr(py_opp, operator)(current_level, level)
 
-        if not event or (not event_status and event.triggered):
+        if event is None or (not event_status and event.triggered):
             # If event_status is still correct keep it otherwise overwrite it.
-            self._container_events[(id_, level, operator)] = self._env.event()
+            event = self._env.event()
+            self._container_events[key] = event
+            sequence = self._event_sequence.setdefault(key, next(self._sequence))
 
-        self.update_container_events()
-        return self._container_events[(id_, level, operator)]
+            if event_status:
+                self._trigger(key, event)
+            else:
+                self._thresholds.setdefault(id_, ThresholdIndex()).add(
+                    level, operator, sequence
+                )
+
+        return event
 
     def get_empty_event(self, id_="default"):
         return self.get_container_event(
@@ -104,27 +172,64 @@ class EventsContainer(simpy.FilterStore):
         )
 
     def update_container_events(self):
-        for (id_, level, operator), event in self._container_events.items():
-            current_level = self.get_level(id_)
-            event_status = getattr(py_opp, operator)(current_level, level)
-            if event_status and not event.triggered:
-                event.succeed()
+        """Trigger the events whose thresholds are crossed by the changed levels."""
+        crossed = []
+        for id_ in self._changed_ids:
+            if id_ in self._thresholds:
+                crossed.extend(
+                    (sequence, (id_, level, operator))
+                    for level, operator, sequence in self._thresholds[id_].pop_crossed(
+                        self.get_level(id_)
+                    )
+                )
+        self._changed_ids.clear()
+
+        # trigger the events in the order in which they were registered
+        for _, key in sorted(crossed):
+            self._trigger(key, self._container_events[key])
+
+    def _trigger(self, key, event):
+        event.callbacks.append(lambda event: self._evict(key, event))
+        event.succeed()
+
+    def _evict(self, key, event):
+        """Remove a processed event, nobody can be waiting on it anymore."""
+        if self._container_events.get(key) is event:
+            del self._container_events[key]
+            del self._event_sequence[key]
+
+    def crosses_threshold(self, low, high, id_="default"):
+        """Return whether a level between low and high would trigger a pending event."""
+        self.update_container_events()
+        thresholds = self._thresholds.get(id_)
+        return thresholds is not None and thresholds.crossed_by(low, high)
 
     def put(self, amount, id_="default"):
-        store_status = super().get(lambda state: state["id"] == id_).value
-        store_status["level"] = store_status["level"] + amount
-        put_event = super().put(store_status)
-        put_event.callbacks.append(self._callback)
-
-        yield put_event
+        self._set_level(id_, self._levels[id_] + amount)
+        yield self._level_changed_event()
 
     def get(self, amount, id_="default"):
-        store_status = super().get(lambda state: state["id"] == id_).value
-        store_status["level"] = store_status["level"] - amount
-        get_event = super().put(store_status)
-        get_event.callbacks.append(self._callback)
+        self._set_level(id_, self._levels[id_] - amount)
+        yield self._level_changed_event()
+
+    def shift_levels(self, amounts):
+        """Shift the levels of several container ids at once, without yielding."""
+        for id_, amount in amounts.items():
+            self._set_level(id_, self._levels[id_] + amount)
+        self.update_container_events()
 
-        yield get_event
+    def _set_level(self, id_, level):
+        self._levels[id_] = level
+        self._changed_ids.add(id_)
+        self.version += 1
+        if self.level_ranges is not None:
+            low, high = self.level_ranges.get(id_, (level, level))
+            self.level_ranges[id_] = (min(low, level), max(high, level))
+
+    def _level_changed_event(self):
+        event = self._env.event()
+        event.callbacks.append(self._callback)
+        return event.succeed()
 
     def _callback(self, event, id_="default"):
         self.update_container_events()
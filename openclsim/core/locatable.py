@@ -1,6 +1,5 @@
 """Component to locate the simulation objecs."""
-import pyproj
-import shapely.geometry
+from .distance import distance_cache, get_coordinates, wgs84
 
 
 class Locatable:
@@ -18,13 +17,24 @@ class Locatable:
         super().__init__(*args, **kwargs)
         """Initialization"""
         self.geometry = geometry
-        self.wgs84 = pyproj.Geod(ellps="WGS84")
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @geometry.setter
+    def geometry(self, geometry):
+        self._geometry = geometry
+        self._geometry_version = getattr(self, "_geometry_version", -1) + 1
+
+    @property
+    def wgs84(self):
+        """Return the pyproj.Geod shared by all the locatables."""
+        return wgs84
 
     def is_at(self, locatable, tolerance=100):
-        current_location = shapely.geometry.asShape(self.geometry)
-        other_location = shapely.geometry.asShape(locatable.geometry)
-        _, _, distance = self.wgs84.inv(
-            current_location.x, current_location.y, other_location.x, other_location.y
+        distance = distance_cache.distance(
+            get_coordinates(self.geometry), get_coordinates(locatable.geometry)
         )
 
         return distance < tolerance
@@ -36,3 +46,9 @@ class Locatable:
 
         state.update({"geometry": self.geometry})
         return state
+
+    def get_state_version(self):
+        version = ()
+        if hasattr(super(), "get_state_version"):
+            version = super().get_state_version()
+        return version + (self._geometry_version,)
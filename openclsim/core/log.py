@@ -1,7 +1,9 @@
 """Component to log the simulation objecs."""
-import datetime
+import functools
+from collections.abc import Mapping
 from enum import Enum
 
+from .log_backend import ColumnarLogBackend
 from .simpy_object import SimpyObject
 
 
@@ -19,19 +21,106 @@ class LogState(Enum):
     UNKNOWN = -1
 
 
+class ActivityLabel(Mapping):
+    """
+    Immutable label of a log entry, which refers to the activity it was logged for.
+
+    The label behaves as the dictionary {"type": type_, "ref": ref} and compares
+    equal to it, but it is immutable and hashable, so a single label can be shared
+    by the log entries of an activity and interned by the log backend as it is.
+
+    Parameters
+    ----------
+    type_
+        The kind of reference, such as "subprocess" or "additional log"
+    ref
+        The id of the activity referred to
+    """
+
+    __slots__ = ("type", "ref", "_items")
+
+    def __init__(self, type_, ref):
+        object.__setattr__(self, "type", type_)
+        object.__setattr__(self, "ref", ref)
+        object.__setattr__(self, "_items", (("type", type_), ("ref", ref)))
+
+    def __setattr__(self, name, value):
+        """Raise an AttributeError, since the label is immutable."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, key):
+        """Return the type or the ref."""
+        if key == "type":
+            return self.type
+        if key == "ref":
+            return self.ref
+        raise KeyError(key)
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return iter(("type", "ref"))
+
+    def __len__(self):
+        """Return the number of keys."""
+        return 2
+
+    def __hash__(self):
+        """Return the hash of the items."""
+        return hash(self._items)
+
+    def __repr__(self):
+        """Return the representation of the label."""
+        return f"{type(self).__name__}({self.type!r}, {self.ref!r})"
+
+    def __reduce__(self):
+        """Pickle the label by its type and ref."""
+        return type(self), (self.type, self.ref)
+
+    def items(self):
+        """Return the (key, value) pairs as a tuple."""
+        return self._items
+
+
+@functools.lru_cache(maxsize=None)
+def has_state_version(cls):
+    """Return whether every get_state in the MRO of a class has a get_state_version."""
+    return all(
+        "get_state_version" in vars(base)
+        for base in cls.__mro__
+        if "get_state" in vars(base)
+    )
+
+
 class Log(SimpyObject):
-    """Log class to log the object activities."""
+    """
+    Log class to log the object activities.
+
+    Parameters
+    ----------
+    log_backend
+        Callable returning the LogBackend in which the log entries are stored.
+        By default the entries are stored in a ColumnarLogBackend, while a
+        StreamingLogBackend writes them to disk during the simulation.
 
-    def __init__(self, *args, **kwargs):
+    The object state is only captured again when the state version of one of the
+    components changed since the last entry, otherwise the entry refers to the last
+    snapshot. Components which add to get_state should therefore add to
+    get_state_version as well, or the state is captured for every entry.
+    """
+
+    def __init__(self, log_backend=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         """Initialization"""
-        self.log = {
-            "Timestamp": [],
-            "ActivityID": [],
-            "ActivityState": [],
-            "ObjectState": [],
-            "ActivityLabel": [],
-        }
+        if log_backend is None:
+            log_backend = ColumnarLogBackend
+        self.log_backend = log_backend()
+        self._state_snapshot = None
+        self._state_version = None
+
+    @property
+    def log(self):
+        """Return the log as a dictionary of lists."""
+        return self.log_backend.to_dict()
 
     def log_entry(
         self,
@@ -41,19 +130,29 @@ class Log(SimpyObject):
         additional_state=None,
         activity_label={},
     ):
-        object_state = self.get_state()
+        object_state = self.get_state_snapshot()
         if additional_state:
+            object_state = dict(object_state)
             object_state.update(additional_state)
 
-        if activity_label != {}:
+        if activity_label:
             assert activity_label.get("type") is not None
             assert activity_label.get("ref") is not None
 
-        self.log["Timestamp"].append(datetime.datetime.utcfromtimestamp(t))
-        self.log["ActivityID"].append(activity_id)
-        self.log["ActivityState"].append(activity_state.name)
-        self.log["ObjectState"].append(object_state)
-        self.log["ActivityLabel"].append(activity_label)
+        self.log_backend.append(
+            t, activity_id, activity_state, object_state, activity_label
+        )
+
+    def get_state_snapshot(self):
+        """Return the object state, captured again only if its version changed."""
+        if not has_state_version(type(self)):
+            return self.get_state()
+
+        version = self.get_state_version()
+        if self._state_snapshot is None or version != self._state_version:
+            self._state_snapshot = self.get_state()
+            self._state_version = version
+        return self._state_snapshot
 
     def get_state(self):
         """Add an empty instance of the get state function so that it is always available."""
@@ -61,3 +160,10 @@ class Log(SimpyObject):
         if hasattr(super(), "get_state"):
             state = super().get_state()
         return state
+
+    def get_state_version(self):
+        """Return a tuple which changes whenever the result of get_state changes."""
+        version = ()
+        if hasattr(super(), "get_state_version"):
+            version = super().get_state_version()
+        return version
@@ -0,0 +1,539 @@
+"""Storage backends for the log of the simulation objects."""
+import datetime
+import functools
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pa = None
+
+
+def to_microseconds(timestamps):
+    """
+    Convert simulation times in seconds to integer microseconds since the epoch.
+
+    The fraction of a second is rounded like datetime.datetime.utcfromtimestamp, so
+    the converted timestamps are identical to the ones which were logged before.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    seconds = np.trunc(timestamps)
+    microseconds = np.round((timestamps - seconds) * 1e6)
+    return seconds.astype(np.int64) * 1_000_000 + microseconds.astype(np.int64)
+
+
+def to_datetime(timestamps):
+    """Convert simulation times in seconds to a pandas DatetimeIndex, vectorized."""
+    return pd.to_datetime(to_microseconds(timestamps), unit="us")
+
+
+class LogBackend(ABC):
+    """
+    Base class for the storage of the log entries of a Log object.
+
+    A backend receives the log entries one by one through append and is
+    responsible for presenting them as the dictionary of lists which is
+    exposed as Log.log.
+    """
+
+    __slots__ = ()
+
+    columns = [
+        "Timestamp",
+        "ActivityID",
+        "ActivityState",
+        "ObjectState",
+        "ActivityLabel",
+    ]
+
+    @abstractmethod
+    def append(self, t, activity_id, activity_state, object_state, activity_label):
+        """Append a log entry."""
+
+    @abstractmethod
+    def entry(self, i):
+        """Return the (t, activity_id, activity_state, object_state, activity_label) of entry i."""
+
+    @abstractmethod
+    def get_timestamps(self):
+        """Return the timestamps as a float64 array of seconds."""
+
+    @abstractmethod
+    def __len__(self):
+        """Return the number of log entries."""
+
+    @abstractmethod
+    def to_dict(self):
+        """Return the log as a dictionary of lists."""
+
+
+class DictLogBackend(LogBackend):
+    """Store the log entries directly in a dictionary of lists."""
+
+    __slots__ = ("log",)
+
+    def __init__(self):
+        self.log = {column: [] for column in self.columns}
+
+    def append(self, t, activity_id, activity_state, object_state, activity_label):
+        self.log["Timestamp"].append(datetime.datetime.utcfromtimestamp(t))
+        self.log["ActivityID"].append(activity_id)
+        self.log["ActivityState"].append(activity_state.name)
+        self.log["ObjectState"].append(dict(object_state))
+        self.log["ActivityLabel"].append(dict(activity_label))
+
+    def entry(self, i):
+        return (
+            (self.log["Timestamp"][i] - datetime.datetime(1970, 1, 1)).total_seconds(),
+            self.log["ActivityID"][i],
+            self.log["ActivityState"][i],
+            self.log["ObjectState"][i],
+            self.log["ActivityLabel"][i],
+        )
+
+    def get_timestamps(self):
+        return (
+            (pd.to_datetime(self.log["Timestamp"]) - pd.Timestamp(0))
+            .total_seconds()
+            .to_numpy(dtype=np.float64)
+        )
+
+    def __len__(self):
+        """Return the number of log entries."""
+        return len(self.log["Timestamp"])
+
+    def to_dict(self):
+        return self.log
+
+
+class CodeTable:
+    """Intern hashable values into small integer codes."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def code(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        """Return the number of interned values."""
+        return len(self.values)
+
+
+@functools.lru_cache(maxsize=None)
+def _empty(dtype):
+    """Return a shared, read-only empty array of dtype."""
+    data = np.empty(0, dtype=dtype)
+    data.flags.writeable = False
+    return data
+
+
+class GrowableArray:
+    """
+    A one dimensional NumPy buffer which grows by doubling its capacity.
+
+    The buffer is only allocated by the first append, so objects which never log
+    do not hold a buffer.
+
+    Parameters
+    ----------
+    dtype
+        NumPy dtype of the elements
+    capacity
+        Initial number of elements which can be stored without reallocating
+    """
+
+    __slots__ = ("_data", "_size", "_capacity")
+
+    def __init__(self, dtype, capacity: int = 4):
+        self._data = _empty(np.dtype(dtype))
+        self._size = 0
+        self._capacity = capacity
+
+    def append(self, value):
+        if self._size == len(self._data):
+            data = np.empty(max(2 * self._size, self._capacity), dtype=self._data.dtype)
+            data[: self._size] = self._data[: self._size]
+            self._data = data
+        self._data[self._size] = value
+        self._size += 1
+
+    def __len__(self):
+        """Return the number of stored elements."""
+        return self._size
+
+    @property
+    def values(self):
+        """Return a read-only view on the stored elements."""
+        view = self._data[: self._size]
+        view.flags.writeable = False
+        return view
+
+
+class ColumnarLogBackend(LogBackend):
+    """
+    Store the log entries in columnar NumPy buffers.
+
+    The timestamps are stored as float64 seconds and are only converted to
+    datetimes when the log is exported, while the ActivityID,
+    ActivityState and ActivityLabel are interned into integer codes. Entries with
+    an unchanged object state share the same state snapshot, which is stored once
+    in snapshots and referred to by its code. The dictionary of
+    lists is only materialized when it is requested and is cached until the next
+    entry is appended.
+
+    The few ActivityState names are interned in a state_table which is shared by
+    all backends, and the buffers are only allocated when the first entry is
+    appended, which keeps the backend small for the many activities in a model.
+    """
+
+    state_table = CodeTable()
+
+    __slots__ = (
+        "timestamps",
+        "activity_ids",
+        "activity_states",
+        "activity_labels",
+        "object_state_codes",
+        "snapshots",
+        "id_table",
+        "label_table",
+        "_view",
+    )
+
+    def __init__(self, capacity: int = 4):
+        self.timestamps = GrowableArray(np.float64, capacity)
+        self.activity_ids = GrowableArray(np.int32, capacity)
+        self.activity_states = GrowableArray(np.int8, capacity)
+        self.activity_labels = GrowableArray(np.int32, capacity)
+        self.object_state_codes = GrowableArray(np.int32, capacity)
+        self.snapshots = []
+
+        self.id_table = CodeTable()
+        self.label_table = CodeTable()
+        self.label_table.code(())
+
+        self._view = None
+
+    def append(self, t, activity_id, activity_state, object_state, activity_label):
+        self.timestamps.append(t)
+        self.activity_ids.append(self.id_table.code(activity_id))
+        self.activity_states.append(self.state_table.code(activity_state.name))
+        self.activity_labels.append(
+            self.label_table.code(tuple(activity_label.items()))
+        )
+        if not self.snapshots or object_state is not self.snapshots[-1]:
+            self.snapshots.append(object_state)
+        self.object_state_codes.append(len(self.snapshots) - 1)
+        self._view = None
+
+    def entry(self, i):
+        return (
+            float(self.timestamps.values[i]),
+            self.id_table.values[self.activity_ids.values[i]],
+            self.state_table.values[self.activity_states.values[i]],
+            self.snapshots[self.object_state_codes.values[i]],
+            dict(self.label_table.values[self.activity_labels.values[i]]),
+        )
+
+    def get_timestamps(self):
+        return self.timestamps.values
+
+    @property
+    def object_states(self):
+        """Return the object state of every entry."""
+        return [self.snapshots[c] for c in self.object_state_codes.values.tolist()]
+
+    def __len__(self):
+        """Return the number of log entries."""
+        return len(self.timestamps)
+
+    def to_dict(self):
+        if self._view is None:
+            ids = self.id_table.values
+            states = self.state_table.values
+            labels = self.label_table.values
+            self._view = {
+                "Timestamp": [
+                    datetime.datetime.utcfromtimestamp(t)
+                    for t in self.timestamps.values.tolist()
+                ],
+                "ActivityID": [ids[c] for c in self.activity_ids.values.tolist()],
+                "ActivityState": [
+                    states[c] for c in self.activity_states.values.tolist()
+                ],
+                "ObjectState": [dict(state) for state in self.object_states],
+                "ActivityLabel": [
+                    dict(labels[c]) for c in self.activity_labels.values.tolist()
+                ],
+            }
+        return self._view
+
+
+def _to_json(value):
+    """Serialize the values of the object states which are not JSON types."""
+    if hasattr(value, "__geo_interface__"):
+        return value.__geo_interface__
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class StreamingLogBackend(LogBackend):
+    """
+    Stream the log entries to disk in batches, keeping the memory use bounded.
+
+    The entries are buffered until batch_size entries are collected, after which
+    the batch is written to an Arrow IPC stream or to a new part of a Parquet
+    dataset. The ObjectState and ActivityLabel are stored as JSON strings, in which
+    geometries are stored as GeoJSON. The written entries can be read with
+    read_log or read_log_batches, or directly with pandas or pyarrow, also while
+    the simulation is still running.
+
+    The backend is used by passing it to a Log object, for example with
+    log_backend=functools.partial(StreamingLogBackend, path="vessel.arrows").
+    The last, partial batch is only written when the backend is closed, so close
+    the backend at the end of the simulation, or use it as a context manager:
+
+        with vessel.log_backend:
+            env.run()
+
+    A closed backend can not be appended to, so a simulation which is continued
+    with another env.run should only close the backend after the last run.
+
+    The entries of the current and of the last written batch are kept in memory,
+    so reading back the recent entries, as the fast-forward of cycles does, does
+    not read from disk.
+
+    Parameters
+    ----------
+    path
+        The Arrow IPC stream file or the directory of the Parquet dataset
+    batch_size
+        Number of entries which are buffered before they are written
+    file_format
+        Either "arrow" or "parquet"
+    """
+
+    def __init__(self, path, batch_size: int = 10_000, file_format: str = "arrow"):
+        if pa is None:
+            raise ImportError("The StreamingLogBackend requires pyarrow.")
+        assert file_format in [
+            "arrow",
+            "parquet",
+        ], f"Chosen file format ({file_format}) is not supported please choose from: 'arrow', 'parquet'"
+
+        self.schema = pa.schema(
+            [
+                ("Timestamp", pa.timestamp("us")),
+                ("ActivityID", pa.string()),
+                ("ActivityState", pa.string()),
+                ("ObjectState", pa.string()),
+                ("ActivityLabel", pa.string()),
+            ]
+        )
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.file_format = file_format
+        self.nr_written = 0
+        self._nr_batches = 0
+        self._buffer = []
+        self._last_batch = []
+        self._batch_sizes = []
+        self._sink = None
+        self._writer = None
+        self.closed = False
+
+        if file_format == "parquet":
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    def append(self, t, activity_id, activity_state, object_state, activity_label):
+        if self.closed:
+            raise ValueError(
+                f"The log {self.path} is closed and can not be appended to."
+            )
+        self._buffer.append(
+            (t, activity_id, activity_state.name, object_state, activity_label)
+        )
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered entries."""
+        if not self._buffer:
+            return
+
+        t, activity_ids, activity_states, object_states, activity_labels = zip(
+            *self._buffer
+        )
+        batch = pa.record_batch(
+            [
+                pa.array(to_microseconds(t), type=pa.timestamp("us")),
+                pa.array(activity_ids, type=pa.string()),
+                pa.array(activity_states, type=pa.string()),
+                pa.array(
+                    [json.dumps(state, default=_to_json) for state in object_states],
+                    type=pa.string(),
+                ),
+                pa.array(
+                    [json.dumps(dict(label)) for label in activity_labels],
+                    type=pa.string(),
+                ),
+            ],
+            schema=self.schema,
+        )
+
+        if self.file_format == "parquet":
+            pyarrow.parquet.write_table(
+                pa.Table.from_batches([batch]),
+                self.path / f"part-{self._nr_batches:05d}.parquet",
+            )
+        else:
+            if self._writer is None:
+                self._sink = pa.OSFile(str(self.path), "wb")
+                self._writer = pyarrow.ipc.new_stream(self._sink, self.schema)
+            self._writer.write_batch(batch)
+
+        self._nr_batches += 1
+        self._batch_sizes.append(len(self._buffer))
+        self.nr_written += len(self._buffer)
+        self._last_batch = self._buffer
+        self._buffer = []
+
+    def close(self):
+        """Write the buffered entries and close the file."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+            self._writer = None
+        self.closed = True
+
+    def __enter__(self):
+        """Return the backend, which is closed when the context is left."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Write the buffered entries and close the file."""
+        self.close()
+
+    def entry(self, i):
+        if i < 0:
+            i += len(self)
+        if i >= self.nr_written:
+            return self._buffer[i - self.nr_written]
+
+        last_batch_start = self.nr_written - len(self._last_batch)
+        if i >= last_batch_start:
+            return self._last_batch[i - last_batch_start]
+
+        # only the batch of the entry is read from disk
+        offset = 0
+        for nr, size in enumerate(self._batch_sizes):
+            if i < offset + size:
+                break
+            offset += size
+        row = self._read_batch(nr).iloc[i - offset]
+        return (
+            (row["Timestamp"] - pd.Timestamp(0)).total_seconds(),
+            row["ActivityID"],
+            row["ActivityState"],
+            json.loads(row["ObjectState"]),
+            json.loads(row["ActivityLabel"]),
+        )
+
+    def _read_batch(self, nr):
+        """Read the written batch nr into a pandas DataFrame."""
+        if self.file_format == "parquet":
+            path = self.path / f"part-{nr:05d}.parquet"
+            return pyarrow.parquet.read_table(path).to_pandas()
+
+        with pa.OSFile(str(self.path), "rb") as source:
+            for i, batch in enumerate(pyarrow.ipc.open_stream(source)):
+                if i == nr:
+                    return batch.to_pandas()
+
+    def get_timestamps(self):
+        self.flush()
+        timestamps = [
+            (df["Timestamp"] - pd.Timestamp(0)).dt.total_seconds().to_numpy()
+            for df in read_log_batches(self.path, columns=["Timestamp"])
+        ]
+        if not timestamps:
+            return np.empty(0, dtype=np.float64)
+        return np.concatenate(timestamps)
+
+    def __len__(self):
+        """Return the number of log entries."""
+        return self.nr_written + len(self._buffer)
+
+    def to_dict(self):
+        """
+        Return the log as a dictionary of lists.
+
+        This reads all the written entries back into memory, with the object states
+        as parsed from JSON.
+        """
+        self.flush()
+        log = {column: [] for column in self.columns}
+        if self.nr_written == 0:
+            return log
+
+        df = read_log(self.path)
+        log["Timestamp"] = df["Timestamp"].dt.to_pydatetime().tolist()
+        log["ActivityID"] = df["ActivityID"].tolist()
+        log["ActivityState"] = df["ActivityState"].tolist()
+        log["ObjectState"] = [json.loads(state) for state in df["ObjectState"]]
+        log["ActivityLabel"] = [json.loads(label) for label in df["ActivityLabel"]]
+        return log
+
+
+def read_log_batches(path, columns=None):
+    """
+    Read the entries written by a StreamingLogBackend batch by batch.
+
+    Parameters
+    ----------
+    path
+        The Arrow IPC stream file or the directory of the Parquet dataset
+    columns
+        The columns to read, by default all the columns
+
+    Yields
+    ------
+    pandas.DataFrame
+        The entries of a batch
+    """
+    path = Path(path)
+    if path.is_dir():
+        for part in sorted(path.glob("part-*.parquet")):
+            yield pyarrow.parquet.read_table(part, columns=columns).to_pandas()
+    else:
+        with pa.OSFile(str(path), "rb") as source:
+            for batch in pyarrow.ipc.open_stream(source):
+                if columns is not None:
+                    batch = batch.select(columns)
+                yield batch.to_pandas()
+
+
+def read_log(path, columns=None):
+    """Read the entries written by a StreamingLogBackend into a pandas DataFrame."""
+    batches = list(read_log_batches(path, columns=columns))
+    if not batches:
+        return pd.DataFrame(columns=columns or LogBackend.columns)
+    return pd.concat(batches, ignore_index=True)
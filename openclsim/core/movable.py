@@ -4,6 +4,7 @@ import logging
 import shapely.geometry
 
 from .container import HasContainer, HasMultiContainer
+from .distance import distance_cache, get_coordinates
 from .locatable import Locatable
 from .log import LogState
 from .simpy_object import SimpyObject
@@ -22,12 +23,15 @@ class Movable(SimpyObject, Locatable):
     ----------
     v
         speed
+    distance_matrix
+        Optional DistanceMatrix with the precomputed distances between the sites
     """
 
-    def __init__(self, v: float = 1, *args, **kwargs):
+    def __init__(self, v: float = 1, distance_matrix=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         """Initialization"""
         self.v = v
+        self.distance_matrix = distance_matrix
 
     def move(self, destination, engine_order=1.0, duration=None):
         """
@@ -69,9 +73,15 @@ class Movable(SimpyObject, Locatable):
 
     def sailing_duration(self, origin, destination, engine_order, verbose=True):
         """Determine the sailing duration."""
-        orig = shapely.geometry.asShape(self.geometry)
-        dest = shapely.geometry.asShape(destination.geometry)
-        _, _, distance = self.wgs84.inv(orig.x, orig.y, dest.x, dest.y)
+        distance = None
+        if self.distance_matrix is not None:
+            distance = self.distance_matrix.get_distance(
+                self.geometry, destination.geometry
+            )
+        if distance is None:
+            distance = distance_cache.distance(
+                get_coordinates(self.geometry), get_coordinates(destination.geometry)
+            )
 
         return distance / (self.current_speed * engine_order)
 
@@ -2,7 +2,7 @@
 import logging
 
 from .container import HasContainer
-from .log import Log, LogState
+from .log import ActivityLabel, Log, LogState
 from .resource import HasResource
 from .simpy_object import SimpyObject
 
@@ -121,19 +121,17 @@ class Processor(SimpyObject):
                 t=start_time,
                 activity_id=self.activity_id,
                 activity_state=LogState.WAIT_START,
-                activity_label={
-                    "type": "subprocess",
-                    "ref": f"waiting {obj.name} content",
-                },
+                activity_label=ActivityLabel(
+                    "subprocess", f"waiting {obj.name} content"
+                ),
             )
             self.log_entry(
                 t=end_time,
                 activity_id=self.activity_id,
                 activity_state=LogState.WAIT_STOP,
-                activity_label={
-                    "type": "subprocess",
-                    "ref": f"waiting {obj.name} content",
-                },
+                activity_label=ActivityLabel(
+                    "subprocess", f"waiting {obj.name} content"
+                ),
             )
 
     def determine_processor_amount(
@@ -2,7 +2,9 @@
 
 from .base_activities import AbstractPluginClass, GenericActivity, PluginActivity
 from .basic_activity import BasicActivity
-from .helpers import get_subprocesses, register_processes
+from .compiler import CompiledActivity, compile_processes
+from .fast_forward import CycleFastForward
+from .helpers import RegistrationPlan, get_subprocesses, register_processes
 from .move_activity import MoveActivity
 from .parallel_activity import ParallelActivity
 from .sequential_activity import SequentialActivity
@@ -24,4 +26,8 @@ __all__ = [
     "ParallelActivity",
     "register_processes",
     "get_subprocesses",
+    "RegistrationPlan",
+    "CycleFastForward",
+    "CompiledActivity",
+    "compile_processes",
 ]
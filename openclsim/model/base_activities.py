@@ -6,6 +6,8 @@ import simpy
 
 import openclsim.core as core
 
+from .expression import compile_expression, expression_key
+
 
 class AbstractPluginClass(ABC):
     """
@@ -128,6 +130,7 @@ class GenericActivity(PluginActivity):
         self.requested_resources = requested_resources
         self.keep_resources = keep_resources
         self.done_event = self.env.event()
+        self._expressions = {}
 
     def register_process(self):
         # replace the events
@@ -147,60 +150,27 @@ class GenericActivity(PluginActivity):
         self.registry.setdefault("id", {}).setdefault(self.id, set()).add(self)
 
     def parse_expression(self, expr):
+        """Return the simpy event of an expression, using its compiled Expression."""
         if isinstance(expr, simpy.Event):
             return expr
-        if isinstance(expr, list):
-            return self.env.all_of([self.parse_expression(item) for item in expr])
-        if isinstance(expr, dict):
-            if "and" in expr:
-                return self.env.all_of(
-                    [self.parse_expression(item) for item in expr["and"]]
-                )
-            if "or" in expr:
-                return self.env.any_of(
-                    [self.parse_expression(item) for item in expr["or"]]
-                )
-            if expr.get("type") == "container":
-                id_ = expr.get("id_", "default")
-                obj = expr["concept"]
-                if (
-                    expr.get("state") in ["gt", "ge", "lt", "le"]
-                    and expr.get("level") is not None
-                ):
-                    return obj.container.get_container_event(
-                        level=expr["level"],
-                        operator=expr["state"],
-                        id_=id_,
-                    )
-                elif expr["state"] == "full":
-                    return obj.container.get_full_event(id_=id_)
-                elif expr["state"] == "empty":
-                    return obj.container.get_empty_event(id_=id_)
-                raise ValueError
-
-            if expr.get("type") == "activity":
-                if expr.get("state") != "done":
-                    raise ValueError(
-                        f"Unknown state {expr.get('state')} in ActivityExpression."
-                    )
-                key = expr.get("ID", expr.get("name"))
-                activity_ = self.registry.get("id", {}).get(
-                    key, self.registry.get("name", {}).get(key)
-                )
+        return self.compile_expression(expr).event()
 
-                if activity_ is None:
-                    raise Exception(
-                        f"No activity found in ActivityExpression for id/name {key}"
-                    )
-                return self.env.all_of(
-                    [activity_item.main_process for activity_item in activity_]
-                )
+    def compile_expression(self, expr):
+        """
+        Compile an expression once and reuse it for equal expressions.
 
-            raise ValueError
+        The compiled Expression caches the registry lookups and only renews the
+        simpy events when the underlying events have been replaced.
+        """
+        key = expression_key(expr)
+        if key is None:
+            return compile_expression(expr, self.env, self.registry)
 
-        raise ValueError(
-            f"{type(expr)} is not a valid input type. Valid input types are: simpy.Event, dict, and list"
-        )
+        compiled = self._expressions.get(key)
+        if compiled is None:
+            compiled = compile_expression(expr, self.env, self.registry)
+            self._expressions[key] = compiled
+        return compiled
 
     def delayed_process(
         self,
@@ -238,10 +208,7 @@ class GenericActivity(PluginActivity):
                     t=start_time,
                     activity_id=activity_log.id,
                     activity_state=core.LogState.WAIT_START,
-                    activity_label={
-                        "type": "additional log",
-                        "ref": self.id,
-                    },
+                    activity_label=core.ActivityLabel("additional log", self.id),
                 )
 
             # log stop
@@ -255,10 +222,7 @@ class GenericActivity(PluginActivity):
                     t=env.now,
                     activity_id=activity_log.id,
                     activity_state=core.LogState.WAIT_STOP,
-                    activity_label={
-                        "type": "additional log",
-                        "ref": self.id,
-                    },
+                    activity_label=core.ActivityLabel("additional log", self.id),
                 )
 
         yield from self.main_process_function(activity_log=self, env=self.env)
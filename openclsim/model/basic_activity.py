@@ -65,10 +65,7 @@ class BasicActivity(GenericActivity):
                     t=env.now,
                     activity_id=activity_log.id,
                     activity_state=core.LogState.START,
-                    activity_label={
-                        "type": "additional log",
-                        "ref": self.id,
-                    },
+                    activity_label=core.ActivityLabel("additional log", self.id),
                 )
 
         yield env.timeout(self.duration)
@@ -82,10 +79,7 @@ class BasicActivity(GenericActivity):
                     t=env.now,
                     activity_id=activity_log.id,
                     activity_state=core.LogState.STOP,
-                    activity_label={
-                        "type": "additional log",
-                        "ref": self.id,
-                    },
+                    activity_label=core.ActivityLabel("additional log", self.id),
                 )
 
         args_data["start_preprocessing"] = start_time
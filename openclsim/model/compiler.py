@@ -0,0 +1,323 @@
+"""Compiler of an activity tree into a flat, table-driven process."""
+from functools import partial
+
+import openclsim.core as core
+
+from .fast_forward import CycleFastForward
+from .helpers import RegistrationPlan
+from .parallel_activity import ParallelActivity
+from .sequential_activity import SequentialActivity
+from .while_activity import ConditionProcessMixin
+
+# the operations of the steps of a compiled activity
+ARM = "arm"
+ENTER = "enter"
+RUN = "run"
+PRE = "pre"
+LOG = "log"
+POST = "post"
+DONE = "done"
+LOOP = "loop"
+CYCLE = "cycle"
+CHECK = "check"
+PARALLEL = "parallel"
+
+
+def _subprocess_label(sub_process):
+    return core.ActivityLabel("subprocess", sub_process.id)
+
+
+def _compile_sequence(activity, steps):
+    for sub_process in activity.sub_processes:
+        label = _subprocess_label(sub_process)
+        steps.append((LOG, activity, (core.LogState.START, label)))
+        _compile(sub_process, steps)
+        steps.append((LOG, activity, (core.LogState.STOP, label)))
+
+
+def _compile(activity, steps):
+    """Append the steps of an activity and its sub processes to steps."""
+    steps.append((ENTER, activity, None))
+
+    if isinstance(activity, SequentialActivity):
+        steps.append((PRE, activity, None))
+        steps.append((LOG, activity, (core.LogState.START, {})))
+        _compile_sequence(activity, steps)
+        steps.append((LOG, activity, (core.LogState.STOP, {})))
+        steps.append((POST, activity, None))
+
+    elif isinstance(activity, ConditionProcessMixin):
+        steps.append((PRE, activity, None))
+        steps.append((LOG, activity, (core.LogState.START, {})))
+        steps.append((LOOP, activity, None))
+        body = len(steps)
+        steps.append((CYCLE, activity, None))
+        _compile_sequence(activity, steps)
+        steps.append((CHECK, activity, body))
+        steps.append((LOG, activity, (core.LogState.STOP, {})))
+        steps.append((POST, activity, None))
+
+    elif isinstance(activity, ParallelActivity):
+        steps.append((PRE, activity, None))
+        steps.append((LOG, activity, (core.LogState.START, {})))
+        branches = [_compile(sub_process, []) for sub_process in activity.sub_processes]
+        steps.append((PARALLEL, activity, branches))
+        steps.append((LOG, activity, (core.LogState.STOP, {})))
+        steps.append((POST, activity, None))
+
+    elif hasattr(activity, "sub_processes"):
+        raise ValueError(
+            f"The activity {activity.name} of type {type(activity).__name__} cannot be compiled."
+        )
+
+    else:
+        steps.append((RUN, activity, None))
+
+    steps.append((DONE, activity, None))
+    return steps
+
+
+class _Loop:
+    """The state of a running WhileActivity or RepeatActivity."""
+
+    def __init__(self, activity):
+        self.static_condition_event = activity.parse_expression(
+            activity.condition_event
+        )
+        self.fast_forward = (
+            CycleFastForward(activity) if activity.fast_forward else None
+        )
+        self.repetitions = 1
+
+
+class CompiledActivity:
+    """
+    An activity tree compiled into a flat table of steps, executed by one process.
+
+    The interpreted activity tree starts a simpy process for every activity in every
+    iteration, which waits for its parent and the previous activity through the
+    start_event_parent expressions. The compiled activity runs the tree in a single
+    process instead, by walking a table of steps in which the transitions of the
+    SequentialActivity, WhileActivity and RepeatActivity are precomputed, with the
+    basic activities executed inline. A ParallelActivity runs every branch in a
+    process of its own.
+
+    The logs are the same as those of the interpreted tree. The container
+    reservations are made, the start events are evaluated and the activities are
+    added to the registry at the same moments, and the main_process of every
+    activity is an event which succeeds when the activity is done, so expressions
+    waiting for the activities keep working.
+
+    Parameters
+    ----------
+    activity
+        The top level activity of the tree, which should not be registered with
+        register_processes
+    """
+
+    def __init__(self, activity):
+        self.activity = activity
+        self.env = activity.env
+        self.items = RegistrationPlan(activity).items
+
+        steps = _compile(activity, [(ARM, activity, self.items)])
+        # the process itself is the main_process of the top level activity
+        self.steps = steps[:-1]
+
+        self.operations = {
+            ARM: self._arm,
+            ENTER: self._enter,
+            RUN: self._run,
+            PRE: self._pre,
+            LOG: self._log,
+            POST: self._post,
+            DONE: self._done,
+            LOOP: self._loop,
+            CYCLE: self._cycle,
+            CHECK: self._check,
+            PARALLEL: self._parallel,
+        }
+
+    def register(self):
+        """
+        Add the process of the compiled activity to the simpy environment.
+
+        The activities are added to the registry and get their main_process right
+        away, like register_processes does, so activities outside the tree can refer
+        to them in their start events.
+        """
+        self._register_items(self.items)
+        self.activity.main_process = self.env.process(self.execute(self.steps, {}))
+        return self.activity.main_process
+
+    def execute(self, steps, frame):
+        """
+        Return a generator which executes the steps.
+
+        Every operation returns the index of the next step, or None for the step
+        after it. The frame holds the state of the activities in progress.
+        """
+        index = 0
+        while index < len(steps):
+            operation, activity, argument = steps[index]
+            next_index = yield from self.operations[operation](
+                activity, argument, frame
+            )
+            index = index + 1 if next_index is None else next_index
+
+    def _register_items(self, items):
+        for item in items:
+            if item is not self.activity:
+                item.main_process = self.env.event()
+            item.registry.setdefault("name", {}).setdefault(item.name, set()).add(item)
+            item.registry.setdefault("id", {}).setdefault(item.id, set()).add(item)
+
+    def _arm(self, activity, items, frame):
+        for item in items:
+            if hasattr(item, "make_container_reservation"):
+                yield from item.make_container_reservation()
+            frame[item, ENTER] = (
+                None
+                if item.start_event is None
+                else item.parse_expression(item.start_event)
+            )
+
+    def _enter(self, activity, argument, frame):
+        start_event = frame.pop((activity, ENTER), None)
+        start_time = self.env.now
+        if start_event is not None:
+            yield start_event
+
+        if self.env.now > start_time:
+            additional_logs = getattr(activity, "additional_logs", [])
+            for state, t in [
+                (core.LogState.WAIT_START, start_time),
+                (core.LogState.WAIT_STOP, self.env.now),
+            ]:
+                activity.log_entry(t=t, activity_id=activity.id, activity_state=state)
+                for log in additional_logs:
+                    log.log_entry(
+                        t=t,
+                        activity_id=activity.id,
+                        activity_state=state,
+                        activity_label=core.ActivityLabel(
+                            "additional log", activity.id
+                        ),
+                    )
+
+    def _run(self, activity, argument, frame):
+        yield from activity.main_process_function(activity_log=activity, env=self.env)
+
+    def _pre(self, activity, argument, frame):
+        start_time = self.env.now
+        args_data = {"env": self.env, "activity_log": activity, "activity": activity}
+        yield from activity.pre_process(args_data)
+        args_data["start_preprocessing"] = start_time
+        args_data["start_activity"] = self.env.now
+        frame[activity, PRE] = args_data
+
+    def _log(self, activity, argument, frame):
+        activity_state, activity_label = argument
+        activity.log_entry(
+            t=self.env.now,
+            activity_id=activity.id,
+            activity_state=activity_state,
+            activity_label=activity_label,
+        )
+        yield from ()
+
+    def _post(self, activity, argument, frame):
+        yield from activity.post_process(**frame.pop((activity, PRE)))
+
+    def _done(self, activity, argument, frame):
+        activity.main_process.succeed()
+        yield from ()
+
+    def _loop(self, activity, argument, frame):
+        frame[activity, LOOP] = _Loop(activity)
+        yield from ()
+
+    def _cycle(self, activity, argument, frame):
+        fast_forward = frame[activity, LOOP].fast_forward
+        if fast_forward is not None:
+            fast_forward.start_cycle()
+        yield from ()
+
+    def _check(self, activity, body, frame):
+        loop = frame[activity, LOOP]
+        # like the interpreted loop, wait until the last sub process is seen to be done
+        yield activity.sub_processes[-1].main_process
+
+        reactive_condition_event = activity.parse_expression(activity.condition_event)
+        if (
+            loop.repetitions >= activity.max_iterations
+            or loop.static_condition_event.triggered is True
+            or reactive_condition_event.triggered is True
+        ):
+            if loop.fast_forward is not None:
+                loop.fast_forward.abort_cycle()
+            del frame[activity, LOOP]
+            return None
+
+        loop.repetitions += 1
+        if loop.fast_forward is not None:
+            loop.fast_forward.stop_cycle()
+            loop.repetitions += yield from loop.fast_forward.skip(
+                activity.max_iterations - loop.repetitions
+            )
+
+        self._register_items(activity.registration_plan.items)
+        yield from self._arm(activity, activity.registration_plan.items, frame)
+        return body
+
+    def _parallel(self, activity, branches, frame):
+        stopped = []
+        wakeup = self.env.event()
+
+        def on_stop(index, event):
+            stopped.append(index)
+            if not wakeup.triggered:
+                wakeup.succeed()
+
+        for i, (sub_process, steps) in enumerate(zip(activity.sub_processes, branches)):
+            activity.log_entry(
+                t=self.env.now,
+                activity_id=activity.id,
+                activity_state=core.LogState.START,
+                activity_label=_subprocess_label(sub_process),
+            )
+            branch = self.env.process(self.execute(steps, frame))
+            branch.callbacks.append(partial(on_stop, i))
+
+        # wait until all branches are done, logging them in the order of sub_processes
+        remaining = len(branches)
+        while remaining > 0:
+            if len(stopped) == 0:
+                wakeup = self.env.event()
+                yield wakeup
+
+            for i in sorted(stopped):
+                activity.log_entry(
+                    t=self.env.now,
+                    activity_id=activity.id,
+                    activity_state=core.LogState.STOP,
+                    activity_label=_subprocess_label(activity.sub_processes[i]),
+                )
+            remaining -= len(stopped)
+            stopped.clear()
+
+
+def compile_processes(processes):
+    """
+    Compile the activity trees and register their processes.
+
+    This replaces register_processes for activity trees which are executed by a
+    CompiledActivity. The compiled activities are returned.
+    """
+    if not isinstance(processes, list):
+        processes = [processes]
+
+    compiled = [CompiledActivity(process) for process in processes]
+    for compiled_activity in compiled:
+        compiled_activity.register()
+    return compiled
@@ -0,0 +1,176 @@
+"""Compiled expressions for the start, stop and condition events of the activities."""
+
+from abc import ABC, abstractmethod
+
+import simpy
+
+
+class Expression(ABC):
+    """
+    Base class of a compiled expression.
+
+    A compiled expression returns the simpy event of the expression with event().
+    Registry lookups are resolved once and the simpy events are only renewed when
+    one of the underlying events has been replaced.
+    """
+
+    @abstractmethod
+    def event(self):
+        """Return the simpy event of the expression."""
+
+
+class EventExpression(Expression):
+    """Expression of a fixed simpy event."""
+
+    def __init__(self, event):
+        self._event = event
+
+    def event(self):
+        return self._event
+
+
+class ConditionExpression(Expression):
+    """Expression which combines the events of its children with all_of or any_of."""
+
+    def __init__(self, condition, children):
+        self.condition = condition
+        self.children = children
+        self._events = None
+        self._event = None
+
+    def event(self):
+        events = [child.event() for child in self.children]
+        if self._events is None or any(
+            new is not old for new, old in zip(events, self._events)
+        ):
+            self._events = events
+            self._event = self.condition(events)
+        return self._event
+
+
+class ContainerExpression(Expression):
+    """Expression of a container level event."""
+
+    def __init__(self, concept, state, level=None, id_="default"):
+        self.container = concept.container
+        self.state = state
+        self.level = level
+        self.id_ = id_
+
+    def event(self):
+        if self.state == "full":
+            return self.container.get_full_event(id_=self.id_)
+        if self.state == "empty":
+            return self.container.get_empty_event(id_=self.id_)
+        return self.container.get_container_event(
+            level=self.level, operator=self.state, id_=self.id_
+        )
+
+
+class ActivityExpression(Expression):
+    """Expression which is triggered when all activities with an id or name are done."""
+
+    def __init__(self, env, registry, key):
+        self.env = env
+        self.registry = registry
+        self.key = key
+        self._activities = None
+        self._processes = None
+        self._event = None
+
+    def event(self):
+        if self._activities is None:
+            activities = self.registry.get("id", {}).get(
+                self.key, self.registry.get("name", {}).get(self.key)
+            )
+            if activities is None:
+                raise Exception(
+                    f"No activity found in ActivityExpression for id/name {self.key}"
+                )
+            self._activities = activities
+
+        processes = [activity.main_process for activity in self._activities]
+        if (
+            self._processes is None
+            or len(processes) != len(self._processes)
+            or any(new is not old for new, old in zip(processes, self._processes))
+        ):
+            self._processes = processes
+            self._event = self.env.all_of(processes)
+        return self._event
+
+
+def compile_expression(expr, env, registry):
+    """Compile an expression of the expression language into an Expression."""
+    if isinstance(expr, simpy.Event):
+        return EventExpression(expr)
+    if isinstance(expr, list):
+        return ConditionExpression(
+            env.all_of, [compile_expression(item, env, registry) for item in expr]
+        )
+    if isinstance(expr, dict):
+        if "and" in expr:
+            return ConditionExpression(
+                env.all_of,
+                [compile_expression(item, env, registry) for item in expr["and"]],
+            )
+        if "or" in expr:
+            return ConditionExpression(
+                env.any_of,
+                [compile_expression(item, env, registry) for item in expr["or"]],
+            )
+        if expr.get("type") == "container":
+            id_ = expr.get("id_", "default")
+            if (
+                expr.get("state") in ["gt", "ge", "lt", "le"]
+                and expr.get("level") is not None
+            ):
+                return ContainerExpression(
+                    expr["concept"], expr["state"], expr["level"], id_
+                )
+            elif expr["state"] in ["full", "empty"]:
+                return ContainerExpression(expr["concept"], expr["state"], id_=id_)
+            raise ValueError
+
+        if expr.get("type") == "activity":
+            if expr.get("state") != "done":
+                raise ValueError(
+                    f"Unknown state {expr.get('state')} in ActivityExpression."
+                )
+            return ActivityExpression(env, registry, expr.get("ID", expr.get("name")))
+
+        raise ValueError
+
+    raise ValueError(
+        f"{type(expr)} is not a valid input type. Valid input types are: simpy.Event, dict, and list"
+    )
+
+
+def expression_key(expr):
+    """
+    Return a hashable key of an expression, used to reuse its compiled Expression.
+
+    None is returned for expressions which contain simpy events, since these are
+    replaced by new events in every iteration, or which are not hashable.
+    """
+    if isinstance(expr, list):
+        items = [expression_key(item) for item in expr]
+        if any(item is None for item in items):
+            return None
+        return ("list", tuple(items))
+    if isinstance(expr, dict):
+        items = []
+        for name, value in expr.items():
+            if isinstance(value, (list, dict)):
+                value = expression_key(value)
+                if value is None:
+                    return None
+            elif isinstance(value, simpy.Event):
+                return None
+            items.append((name, value))
+        try:
+            hash(tuple(items))
+        except TypeError:
+            return None
+        return ("dict", tuple(items))
+    return None
@@ -0,0 +1,312 @@
+"""Fast-forward of the identical cycles of the WhileActivity and RepeatActivity."""
+import math
+
+import openclsim.core as core
+
+
+def get_log_objects(activities):
+    """Get the activities and the objects they log to, such as movers and sites."""
+    objects = {}
+    for activity in activities:
+        objects[activity] = None
+        for value in vars(activity).values():
+            values = value if isinstance(value, list) else [value]
+            for item in values:
+                if isinstance(item, core.Log):
+                    objects[item] = None
+    return list(objects)
+
+
+def _isclose(a, b):
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+
+
+def _shift_state(object_state, amounts):
+    """Return a copy of an object state with the container levels shifted."""
+    level = object_state.get("container level")
+    if level is None:
+        return object_state
+
+    object_state = dict(object_state)
+    if isinstance(level, dict):
+        object_state["container level"] = {
+            id_: value + amounts.get(id_, 0) for id_, value in level.items()
+        }
+    else:
+        object_state["container level"] = level + amounts.get("default", 0)
+    return object_state
+
+
+class Cycle:
+    """The log entries and the container levels of one cycle of a loop activity."""
+
+    def __init__(self, env, objects, containers):
+        self.env = env
+        self.objects = objects
+        self.containers = containers
+
+        self.start = env.now
+        self.log_start = [len(obj.log_backend) for obj in objects]
+        self.states = [obj.get_state() for obj in objects]
+        self.levels = [dict(container._levels) for container in containers]
+
+        # the level ranges of a container are recorded by one cycle at a time
+        self.recording = all(container.level_ranges is None for container in containers)
+        if self.recording:
+            for container in containers:
+                container.level_ranges = {
+                    id_: (level, level) for id_, level in container._levels.items()
+                }
+
+    def abort(self):
+        """Stop recording the level ranges, for a cycle which is not measured."""
+        if self.recording:
+            for container in self.containers:
+                container.level_ranges = None
+
+    def stop(self):
+        self.duration = self.env.now - self.start
+        if not self.recording:
+            self.closed = False
+            return
+
+        self.entries = [
+            [obj.log_backend.entry(i) for i in range(start, len(obj.log_backend))]
+            for obj, start in zip(self.objects, self.log_start)
+        ]
+        self.deltas = []
+        self.ranges = []
+        for container, levels in zip(self.containers, self.levels):
+            self.deltas.append(
+                {id_: container._levels[id_] - level for id_, level in levels.items()}
+            )
+            self.ranges.append(
+                {
+                    id_: (low - levels[id_], high - levels[id_])
+                    for id_, (low, high) in container.level_ranges.items()
+                }
+            )
+            container.level_ranges = None
+
+        # apart from the container levels, the objects must return to their state
+        self.closed = all(
+            _without_levels(state) == _without_levels(obj.get_state())
+            for obj, state in zip(self.objects, self.states)
+        )
+
+    def relative_entries(self, i):
+        """Return the entries of object i relative to the start of the cycle."""
+        obj = self.objects[i]
+        amounts = {}
+        if isinstance(obj, core.HasContainer):
+            levels = self.levels[self.containers.index(obj.container)]
+            amounts = {id_: -level for id_, level in levels.items()}
+        return [
+            (
+                t - self.start,
+                activity_id,
+                state,
+                _shift_state(object_state, amounts),
+                label,
+            )
+            for t, activity_id, state, object_state, label in self.entries[i]
+        ]
+
+    def matches(self, other):
+        """Return whether another cycle made the same transitions."""
+        if not (self.closed and other.closed):
+            return False
+        if not _isclose(self.duration, other.duration):
+            return False
+        for deltas, other_deltas in zip(self.deltas, other.deltas):
+            if not all(_isclose(deltas[id_], other_deltas[id_]) for id_ in deltas):
+                return False
+        for ranges, other_ranges in zip(self.ranges, other.ranges):
+            if ranges.keys() != other_ranges.keys() or not all(
+                _isclose(a, b)
+                for id_ in ranges
+                for a, b in zip(ranges[id_], other_ranges[id_])
+            ):
+                return False
+        for i in range(len(self.objects)):
+            entries = self.relative_entries(i)
+            other_entries = other.relative_entries(i)
+            if len(entries) != len(other_entries):
+                return False
+            for entry, other_entry in zip(entries, other_entries):
+                if not _isclose(entry[0], other_entry[0]):
+                    return False
+                if entry[1:3] != other_entry[1:3] or entry[4] != other_entry[4]:
+                    return False
+                if not _states_close(entry[3], other_entry[3]):
+                    return False
+        return True
+
+
+def _without_levels(state):
+    return {key: value for key, value in state.items() if key != "container level"}
+
+
+def _states_close(state, other):
+    if _without_levels(state) != _without_levels(other):
+        return False
+    level, other_level = state.get("container level"), other.get("container level")
+    if isinstance(level, dict) and isinstance(other_level, dict):
+        return level.keys() == other_level.keys() and all(
+            _isclose(level[id_], other_level[id_]) for id_ in level
+        )
+    if level is None or other_level is None:
+        return level is other_level
+    return _isclose(level, other_level)
+
+
+class CycleFastForward:
+    """
+    Fast-forward the cycles of a WhileActivity or RepeatActivity which repeat identically.
+
+    The cycles of the loop are recorded. As soon as two consecutive cycles made the
+    same transitions, took the same time and changed the container levels by the same
+    amounts, the following cycles are assumed to repeat identically. These cycles
+    are then skipped in bulk: the log entries of the last cycle are replayed with
+    shifted timestamps and container levels, after which the clock and the container
+    levels are advanced at once.
+
+    Cycles are only skipped while the loop is uncontended, meaning that no other
+    event is scheduled in the simulation, that nobody is waiting for the resources
+    of the objects in the loop and that the container levels stay within their
+    capacity without crossing the threshold of a pending container event, such as
+    the condition event of a WhileActivity. The last cycle is always simulated.
+
+    Parameters
+    ----------
+    activity
+        The WhileActivity or RepeatActivity whose cycles are fast-forwarded
+    """
+
+    def __init__(self, activity):
+        self.activity = activity
+        self.env = activity.env
+        self.activities = [activity, *activity.registration_plan.items]
+        self.objects = get_log_objects(self.activities)
+        self.containers = list(
+            {
+                obj.container: None
+                for obj in self.objects
+                if isinstance(obj, core.HasContainer)
+            }
+        )
+        self.resources = list(
+            {
+                obj.resource: None
+                for obj in self.objects
+                if isinstance(obj, core.HasResource)
+            }
+        )
+        self.previous = None
+        self.cycle = None
+
+    def start_cycle(self):
+        self.cycle = Cycle(self.env, self.objects, self.containers)
+
+    def stop_cycle(self):
+        self.cycle.stop()
+
+    def abort_cycle(self):
+        """Abort the cycle in progress, when the loop ends after it."""
+        if self.cycle is not None:
+            self.cycle.abort()
+            self.cycle = None
+
+    def skip(self, max_cycles):
+        """
+        Skip up to max_cycles identical cycles.
+
+        This is a generator which advances the clock of the simulation and returns
+        the number of skipped cycles.
+        """
+        previous, cycle = self.previous, self.cycle
+        self.previous, self.cycle = cycle, None
+
+        if (
+            max_cycles <= 0
+            or previous is None
+            or cycle.duration <= 0
+            or not self.uncontended()
+            or not cycle.matches(previous)
+        ):
+            return 0
+
+        nr_cycles = self.nr_skippable_cycles(cycle, max_cycles)
+        if nr_cycles == 0:
+            return 0
+
+        self.replay(cycle, nr_cycles)
+        for container, deltas in zip(self.containers, cycle.deltas):
+            container.shift_levels(
+                {id_: nr_cycles * delta for id_, delta in deltas.items()}
+            )
+        yield self.env.timeout(nr_cycles * cycle.duration)
+
+        # the skipped cycles are not a measurement of the next cycle
+        self.previous = None
+        return nr_cycles
+
+    def uncontended(self):
+        """Return whether nothing else is scheduled or waiting in the simulation."""
+        if self.env.peek() != math.inf:
+            return False
+        if any(len(resource.queue) > 0 for resource in self.resources):
+            return False
+        return not any(getattr(activity, "plugins", []) for activity in self.activities)
+
+    def nr_skippable_cycles(self, cycle, max_cycles):
+        """Return the number of cycles which keep the levels within their bounds."""
+
+        def feasible(nr_cycles):
+            if nr_cycles == 0:
+                return True
+            for container, deltas, ranges in zip(
+                self.containers, cycle.deltas, cycle.ranges
+            ):
+                for id_, delta in deltas.items():
+                    level = container.get_level(id_)
+                    relative_low, relative_high = ranges[id_]
+                    last = (nr_cycles - 1) * delta
+                    low = level + min(0, last) + relative_low
+                    high = level + max(0, last) + relative_high
+                    if container.crosses_threshold(low, high, id_=id_):
+                        return False
+                    if not id_.endswith("_reservations") and (
+                        low < 0 or high > container.get_capacity(id_)
+                    ):
+                        return False
+            return True
+
+        # feasibility is monotonic in the number of cycles, so bisect the maximum
+        low, high = 0, max_cycles
+        while low < high:
+            middle = (low + high + 1) // 2
+            if feasible(middle):
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def replay(self, cycle, nr_cycles):
+        """Append the log entries of the skipped cycles to the logs of the objects."""
+        for i, obj in enumerate(self.objects):
+            amounts = {}
+            if isinstance(obj, core.HasContainer):
+                amounts = cycle.deltas[self.containers.index(obj.container)]
+
+            for k in range(1, nr_cycles + 1):
+                offset = k * cycle.duration
+                shift = {id_: k * amount for id_, amount in amounts.items()}
+                for t, activity_id, state, object_state, label in cycle.entries[i]:
+                    obj.log_backend.append(
+                        t + offset,
+                        activity_id,
+                        core.LogState[state],
+                        _shift_state(object_state, shift),
+                        label,
+                    )
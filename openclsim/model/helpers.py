@@ -1,4 +1,5 @@
 """Module with helper functions for the simulation."""
+import heapq
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,25 +18,115 @@ def get_subprocesses(items):
     return items
 
 
-def register_processes(processes):
-    """Register all the processes iteratively."""
-    items = list(set(get_subprocesses(processes)))
+def get_activity_references(expr):
+    """Get the ids and names of the activities an expression waits for."""
+    if isinstance(expr, list):
+        for item in expr:
+            yield from get_activity_references(item)
+    elif isinstance(expr, dict):
+        if "and" in expr:
+            yield from get_activity_references(expr["and"])
+        elif "or" in expr:
+            yield from get_activity_references(expr["or"])
+        elif expr.get("type") == "activity":
+            yield expr.get("ID", expr.get("name"))
+
+
+def sort_processes(items):
+    """
+    Sort the activities such that every activity follows the activities it waits for.
+
+    The dependencies are taken from the start_event and start_event_parent
+    expressions of the activities. Activities without a mutual dependency keep their
+    given order. References to activities outside of items are ignored.
 
+    Raises
+    ------
+    ValueError
+        If the start events of the activities depend on each other in a cycle.
+    """
+    position = {item: i for i, item in enumerate(items)}
+
+    activities = {}
     for item in items:
-        item.main_process = None
-
-    registerd_items = []
-    for _ in range(100):
-        unregistered_items = set(items) - set(registerd_items)
-        if len(unregistered_items) == 0:
-            break
-        for item in unregistered_items:
-            try:
-                item.register_process()
-                registerd_items.append(item)
-            except Exception as e:
-                logger.info(e)
-    else:
+        activities.setdefault(getattr(item, "name", None), set()).add(item)
+        activities.setdefault(getattr(item, "id", None), set()).add(item)
+
+    dependents = {item: set() for item in items}
+    nr_dependencies = {item: 0 for item in items}
+    for item in items:
+        dependencies = set()
+        for expr in (
+            getattr(item, "start_event", None),
+            getattr(item, "start_event_parent", None),
+        ):
+            for key in get_activity_references(expr):
+                if key is not None:
+                    dependencies.update(activities.get(key, ()))
+        for dependency in dependencies:
+            dependents[dependency].add(item)
+        nr_dependencies[item] = len(dependencies)
+
+    ready = [position[item] for item in items if nr_dependencies[item] == 0]
+    heapq.heapify(ready)
+
+    ordered = []
+    while ready:
+        item = items[heapq.heappop(ready)]
+        ordered.append(item)
+        for dependent in dependents[item]:
+            nr_dependencies[dependent] -= 1
+            if nr_dependencies[dependent] == 0:
+                heapq.heappush(ready, position[dependent])
+
+    if len(ordered) < len(items):
+        names = ", ".join(
+            sorted(
+                str(getattr(item, "name", item))
+                for item in items
+                if nr_dependencies[item] > 0
+            )
+        )
         raise ValueError(
-            "Due to  recursion in the events of the activities, not all the activities can be registered."
+            f"Due to recursion in the events of the activities, not all the activities can be registered: {names}"
         )
+    return ordered
+
+
+def register_processes(processes):
+    """Register all the processes in the order of their start events."""
+    RegistrationPlan(processes).register()
+
+
+class RegistrationPlan:
+    """
+    Precomputed registration of the activities of an activity tree.
+
+    The tree is flattened and sorted once, with every activity registered after its
+    parent and the activities it waits for, so that the iterations of a
+    WhileActivity or RepeatActivity can re-arm their sub processes without
+    flattening and sorting the tree again.
+
+    Parameters
+    ----------
+    processes
+        An activity or a list of activities, which are registered with all their
+        sub processes
+    """
+
+    def __init__(self, processes):
+        self.items = sort_processes(list(dict.fromkeys(get_subprocesses(processes))))
+
+    def register(self):
+        """Register all the activities of the tree."""
+        for item in self.items:
+            item.main_process = None
+
+        for item in self.items:
+            item.register_process()
+
+    def rearm(self):
+        """Register the activities again which have run since their registration."""
+        for item in self.items:
+            if item.main_process is None or item.main_process.triggered:
+                item.register_process()
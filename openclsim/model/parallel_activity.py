@@ -1,4 +1,6 @@
 """Parallel activity for the simulation."""
+from functools import partial
+
 import openclsim.core as core
 
 from .base_activities import GenericActivity, RegisterSubProcesses
@@ -46,44 +48,47 @@ class ParallelActivity(GenericActivity, RegisterSubProcesses):
 
         self.start_parallel.succeed()
 
-        stop_events = []
-        subprocess_ids = []
-        for sub_process in self.sub_processes:
+        # the callbacks of the sub processes collect the indices of the finished ones
+        # and wake up this process, which logs them in the order of sub_processes
+        stopped = []
+        wakeup = env.event()
+
+        def on_stop(index, event):
+            stopped.append(index)
+            if not wakeup.triggered:
+                wakeup.succeed()
+
+        for (i, sub_process) in enumerate(self.sub_processes):
             activity_log.log_entry(
                 t=env.now,
                 activity_id=activity_log.id,
                 activity_state=core.LogState.START,
-                activity_label={"type": "subprocess", "ref": sub_process.id},
+                activity_label=core.ActivityLabel("subprocess", sub_process.id),
             )
 
-            stop_events.append(
-                {"type": "activity", "state": "done", "name": sub_process.name}
-            )
-            subprocess_ids.append(sub_process.id)
-
-        # wait until all stop events are triggered
-        while len(stop_events) > 0:
-            # wait until any stop event is triggered
-            event_trigger = self.parse_expression(
-                [{"or": [event for event in stop_events]}]
-            )
-            yield event_trigger
-            # add a log line for each triggered stop event and pop it
-            i = 0
-            while i < len(stop_events):
-                if self.parse_expression(stop_events[i]).triggered is True:
-                    stop_events.pop(i)
-                    activity_log.log_entry(
-                        t=env.now,
-                        activity_id=activity_log.id,
-                        activity_state=core.LogState.STOP,
-                        activity_label={
-                            "type": "subprocess",
-                            "ref": subprocess_ids.pop(i),
-                        },
-                    )
-                else:
-                    i += 1
+            if sub_process.main_process.callbacks is None:
+                on_stop(i, sub_process.main_process)
+            else:
+                sub_process.main_process.callbacks.append(partial(on_stop, i))
+
+        # wait until all sub processes are done
+        remaining = len(self.sub_processes)
+        while remaining > 0:
+            if len(stopped) == 0:
+                wakeup = env.event()
+                yield wakeup
+
+            for i in sorted(stopped):
+                activity_log.log_entry(
+                    t=env.now,
+                    activity_id=activity_log.id,
+                    activity_state=core.LogState.STOP,
+                    activity_label=core.ActivityLabel(
+                        "subprocess", self.sub_processes[i].id
+                    ),
+                )
+            remaining -= len(stopped)
+            stopped.clear()
 
         activity_log.log_entry(
             t=env.now,
@@ -51,10 +51,7 @@ class SequentialActivity(GenericActivity, RegisterSubProcesses):
                 t=env.now,
                 activity_id=activity_log.id,
                 activity_state=core.LogState.START,
-                activity_label={
-                    "type": "subprocess",
-                    "ref": sub_process.id,
-                },
+                activity_label=core.ActivityLabel("subprocess", sub_process.id),
             )
 
             stop_event = self.parse_expression(
@@ -72,10 +69,7 @@ class SequentialActivity(GenericActivity, RegisterSubProcesses):
                 t=env.now,
                 activity_id=activity_log.id,
                 activity_state=core.LogState.STOP,
-                activity_label={
-                    "type": "subprocess",
-                    "ref": sub_process.id,
-                },
+                activity_label=core.ActivityLabel("subprocess", sub_process.id),
             )
 
         activity_log.log_entry(
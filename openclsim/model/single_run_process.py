@@ -18,6 +18,7 @@ def single_run_process(
     start_event=None,
     stop_event=[],
     requested_resources={},
+    fast_forward=False,
 ):
     """Single run activity for the simulation."""
     if stop_event == []:
@@ -76,6 +77,7 @@ def single_run_process(
         sub_processes=single_run,
         condition_event=stop_event,
         start_event=start_event,
+        fast_forward=fast_forward,
     )
 
     return single_run, while_activity
@@ -3,7 +3,8 @@
 import openclsim.core as core
 
 from .base_activities import GenericActivity, RegisterSubProcesses
-from .helpers import register_processes
+from .fast_forward import CycleFastForward
+from .helpers import RegistrationPlan
 
 
 class ConditionProcessMixin:
@@ -27,18 +28,19 @@ class ConditionProcessMixin:
         )
 
         static_condition_event = self.parse_expression(self.condition_event)
+        fast_forward = CycleFastForward(self) if self.fast_forward else None
         repetitions = 1
         while True:
+            if fast_forward is not None:
+                fast_forward.start_cycle()
+
             self.start_sequence.succeed()
             for sub_process in self.sub_processes:
                 activity_log.log_entry(
                     t=env.now,
                     activity_id=activity_log.id,
                     activity_state=core.LogState.START,
-                    activity_label={
-                        "type": "subprocess",
-                        "ref": sub_process.id,
-                    },
+                    activity_label=core.ActivityLabel("subprocess", sub_process.id),
                 )
 
                 stop_event = self.parse_expression(
@@ -56,10 +58,7 @@ class ConditionProcessMixin:
                     t=env.now,
                     activity_id=activity_log.id,
                     activity_state=core.LogState.STOP,
-                    activity_label={
-                        "type": "subprocess",
-                        "ref": sub_process.id,
-                    },
+                    activity_label=core.ActivityLabel("subprocess", sub_process.id),
                 )
 
             # We check both the static and reactive event. If a event is triggered
@@ -71,15 +70,24 @@ class ConditionProcessMixin:
                 or static_condition_event.triggered is True
                 or reactive_condition_event.triggered is True
             ):
+                if fast_forward is not None:
+                    fast_forward.abort_cycle()
                 break
             else:
                 repetitions += 1
 
+                # Skip the following cycles if they repeat the last one identically
+                if fast_forward is not None:
+                    fast_forward.stop_cycle()
+                    repetitions += yield from fast_forward.skip(
+                        self.max_iterations - repetitions
+                    )
+
                 # Reset the sequential start events of the subprocesses
                 self.register_subprocesses()
 
-                # Re-add the activities to the simpy environment
-                register_processes(self.sub_processes)
+                # Re-add the activities which have run to the simpy environment
+                self.registration_plan.rearm()
 
         activity_log.log_entry(
             t=env.now,
@@ -105,10 +113,21 @@ class WhileActivity(GenericActivity, ConditionProcessMixin, RegisterSubProcesses
     start_event
         the activity will start as soon as this event is triggered
         by default will be to start immediately
+    fast_forward
+        skip the cycles which repeat the previous cycle identically, see
+        CycleFastForward for the conditions under which cycles are skipped
     """
 
     #     activity_log, env, stop_event, sub_processes, requested_resources, keep_resources
-    def __init__(self, sub_processes, condition_event, show=False, *args, **kwargs):
+    def __init__(
+        self,
+        sub_processes,
+        condition_event,
+        show=False,
+        fast_forward=False,
+        *args,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         """Initialization"""
         self.print = show
@@ -116,9 +135,11 @@ class WhileActivity(GenericActivity, ConditionProcessMixin, RegisterSubProcesses
 
         self.condition_event = condition_event
         self.max_iterations = 1_000_000
+        self.fast_forward = fast_forward
 
         self.register_subprocesses = self.register_sequential_subprocesses
         self.register_subprocesses()
+        self.registration_plan = RegistrationPlan(self.sub_processes)
 
 
 class RepeatActivity(GenericActivity, ConditionProcessMixin, RegisterSubProcesses):
@@ -134,18 +155,31 @@ class RepeatActivity(GenericActivity, ConditionProcessMixin, RegisterSubProcesse
     start_event
         the activity will start as soon as this event is triggered
         by default will be to start immediately
+    fast_forward
+        skip the cycles which repeat the previous cycle identically, see
+        CycleFastForward for the conditions under which cycles are skipped
     """
 
-    def __init__(self, sub_processes, repetitions: int, show=False, *args, **kwargs):
+    def __init__(
+        self,
+        sub_processes,
+        repetitions: int,
+        show=False,
+        fast_forward=False,
+        *args,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         """Initialization"""
 
         self.print = show
         self.sub_processes = sub_processes
         self.max_iterations = repetitions
+        self.fast_forward = fast_forward
         self.condition_event = [
             {"type": "activity", "state": "done", "name": self.name}
         ]
 
         self.register_subprocesses = self.register_sequential_subprocesses
         self.register_subprocesses()
+        self.registration_plan = RegistrationPlan(self.sub_processes)
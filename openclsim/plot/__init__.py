@@ -1,7 +1,14 @@
 """Directory for the simulation plots."""
 
 from .log_dataframe import get_log_dataframe
-from .step_chart import get_step_chart
-from .vessel_planning import get_gantt_chart
+from .step_chart import downsample_levels, get_level_history, get_step_chart
+from .vessel_planning import get_gantt_chart, get_segment_table
 
-__all__ = ["get_gantt_chart", "get_log_dataframe", "get_step_chart"]
+__all__ = [
+    "downsample_levels",
+    "get_gantt_chart",
+    "get_level_history",
+    "get_log_dataframe",
+    "get_segment_table",
+    "get_step_chart",
+]
@@ -1,28 +1,79 @@
 """Get the log of the simulation objects in a pandas dataframe."""
 
+import numpy as np
 import pandas as pd
 
+from openclsim.core.log_backend import ColumnarLogBackend, to_datetime
+
+
+def _expand(records, codes, index):
+    """Expand the unique dictionaries into a column per key for the coded entries."""
+    df = pd.DataFrame(records)
+    if len(df.columns) == 0:
+        return pd.DataFrame(index=index)
+    return df.take(codes).set_axis(index, axis=0)
+
 
 def get_log_dataframe(simulation_object, activities=[]):
-    """Get the log of the simulation objects in a pandas dataframe."""
+    """
+    Get the log of the simulation objects in a pandas dataframe.
+
+    The entries are sorted by their timestamp. The ActivityID is replaced by the name
+    of the activity if it is found in activities, while the ObjectState and
+    ActivityLabel are expanded into a column per key.
+
+    The dataframe is built from the unique values of every column and the codes of
+    the entries, so that the dictionaries of the ObjectState and ActivityLabel are
+    handled once per unique value instead of once per entry.
+    """
 
     id_map = {act.id: act.name for act in activities}
 
-    df = (
-        pd.DataFrame(simulation_object.log)
-        .sort_values(by=["Timestamp"])
-        .sort_values(by=["Timestamp"])
+    backend = getattr(simulation_object, "log_backend", None)
+    if isinstance(backend, ColumnarLogBackend):
+        timestamps = backend.timestamps.values
+        activity_ids = (backend.id_table.values, backend.activity_ids.values)
+        activity_states = (backend.state_table.values, backend.activity_states.values)
+        object_states = (backend.snapshots, backend.object_state_codes.values)
+        activity_labels = (
+            [dict(label) for label in backend.label_table.values],
+            backend.activity_labels.values,
+        )
+    else:
+        log = simulation_object.log
+        timestamps = pd.to_datetime(log["Timestamp"]).to_numpy()
+        codes, uniques = pd.factorize(pd.Series(log["ActivityID"], dtype=object))
+        activity_ids = (list(uniques), codes)
+        codes, uniques = pd.factorize(pd.Series(log["ActivityState"], dtype=object))
+        activity_states = (list(uniques), codes)
+        object_states = (log["ObjectState"], np.arange(len(timestamps)))
+        activity_labels = (log["ActivityLabel"], np.arange(len(timestamps)))
+
+    order = np.argsort(timestamps, kind="stable")
+    index = pd.Index(order)
+    if isinstance(backend, ColumnarLogBackend):
+        timestamps = to_datetime(timestamps[order])
+    else:
+        timestamps = pd.DatetimeIndex(timestamps[order])
+
+    ids, id_codes = activity_ids
+    names = np.array([id_map.get(id_, id_) for id_ in ids] + [None], dtype=object)
+    states, state_codes = activity_states
+    states = np.array(list(states) + [None], dtype=object)
+
+    df = pd.DataFrame(
+        {
+            "Activity": names[np.asarray(id_codes)[order]],
+            "Timestamp": timestamps,
+            "ActivityState": states[np.asarray(state_codes)[order]],
+        },
+        index=index,
     )
     return pd.concat(
         [
-            (
-                df.filter(items=["ActivityID"])
-                .rename(columns={"ActivityID": "Activity"})
-                .replace(id_map)
-            ),
-            pd.DataFrame(simulation_object.log).filter(["Timestamp", "ActivityState"]),
-            pd.DataFrame(simulation_object.log["ObjectState"]),
-            pd.DataFrame(simulation_object.log["ActivityLabel"]),
+            df,
+            _expand(object_states[0], np.asarray(object_states[1])[order], index),
+            _expand(activity_labels[0], np.asarray(activity_labels[1])[order], index),
         ],
         axis=1,
     )
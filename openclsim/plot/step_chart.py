@@ -1,27 +1,111 @@
 """Get the step chart of the container levels."""
 
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 
-from .log_dataframe import get_log_dataframe
+from openclsim.core.log_backend import ColumnarLogBackend, to_datetime
 
 
-def get_step_chart(simulation_objects):
-    """Get the step chart of the container levels."""
+def _get_level(object_state, id_):
+    level = object_state.get("container level", np.nan)
+    if isinstance(level, dict):
+        return level.get(id_, np.nan)
+    return level
+
+
+def _compact(levels):
+    """Keep the first and last entry of every run of equal levels."""
+    values = levels.to_numpy()
+    changed = np.ones(len(values), dtype=bool)
+    if len(values) > 2:
+        same = (values[1:] == values[:-1]) | (
+            np.isnan(values[1:]) & np.isnan(values[:-1])
+        )
+        changed[1:-1] = ~(same[:-1] & same[1:])
+    return levels[changed]
+
+
+def get_level_history(simulation_object, compact=True):
+    """
+    Get the history of the container levels of a simulation object.
+
+    A pandas series of the level is returned per container id, indexed by the
+    timestamps of the log. The levels are read from the unique object states of the
+    log, rather than once per log entry. With compact, only the first and last entry
+    of every run of equal levels are kept, which leaves the line of the levels
+    unchanged.
+    """
+    backend = simulation_object.log_backend
+    if isinstance(backend, ColumnarLogBackend):
+        states = backend.snapshots
+        codes = backend.object_state_codes.values
+    else:
+        states = simulation_object.log["ObjectState"]
+        codes = np.arange(len(states))
+
+    timestamps = backend.get_timestamps()
+    order = np.argsort(timestamps, kind="stable")
+    index = to_datetime(timestamps[order])
+    codes = np.asarray(codes)[order]
+
+    history = {}
+    for id_ in simulation_object.container.container_list:
+        levels = np.array([_get_level(state, id_) for state in states], dtype=float)
+        levels = pd.Series(levels[codes], index=index, name=id_)
+        history[id_] = _compact(levels) if compact else levels
+    return history
+
+
+def downsample_levels(levels, width):
+    """
+    Downsample a series of levels to a number of pixels along the time axis.
+
+    The time axis is divided into width buckets, of which the first, last, minimum
+    and maximum level are kept. The line through these points covers the same pixels
+    as the line through all the levels, while at most 4 points per pixel remain.
+    """
+    if len(levels) <= 4 * width:
+        return levels
+
+    t = levels.index.asi8.astype(float)
+    span = t[-1] - t[0]
+    buckets = np.zeros(len(t), dtype=np.int64)
+    if span > 0:
+        buckets = np.minimum(((t - t[0]) / span * width).astype(np.int64), width - 1)
+
+    values = levels.to_numpy()
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    stops = np.r_[starts[1:], len(values)] - 1
+
+    # the levels sorted per bucket give the minimum and maximum of every bucket
+    order = np.lexsort((values, buckets))
+    keep = np.zeros(len(values), dtype=bool)
+    keep[starts] = True
+    keep[stops] = True
+    keep[order[starts]] = True
+    keep[order[stops]] = True
+    return levels[keep]
+
+
+def get_step_chart(simulation_objects, width=None):
+    """
+    Get the step chart of the container levels.
+
+    With width, the levels are downsampled to this number of pixels along the
+    time axis with downsample_levels.
+    """
 
     fig = plt.figure(figsize=(14, 7))
     for obj in simulation_objects:
-        df = get_log_dataframe(obj)
-        container_list = obj.container.container_list
-        for container in container_list:
-            if container == "default":
-                y = list(df["container level"])
-            else:
-                y = [y[container] for y in list(df["container level"])]
+        for id_, levels in get_level_history(obj).items():
+            if width is not None:
+                levels = downsample_levels(levels, width)
 
             plt.plot(
-                list(df["Timestamp"]),
-                y,
-                label=f"{obj.name} {container}",
+                levels.index,
+                levels.to_numpy(),
+                label=f"{obj.name} {id_}",
             )
     plt.legend()
     return fig
@@ -2,6 +2,8 @@
 
 import random
 
+import numpy as np
+import pandas as pd
 import plotly.graph_objs as go
 from plotly.offline import init_notebook_mode, iplot
 
@@ -26,18 +28,71 @@ def get_colors(n):
     return ret
 
 
+def _pair_segments(activity, timestamp, activity_state):
+    """
+    Pair the START and STOP of every activity in the log of one vessel.
+
+    Every STOP is paired with the last START of the same activity before it. The
+    arguments are aligned series, the segments are returned in the order of the STOP.
+    """
+    starts = timestamp.where(activity_state == "START")
+    starts = starts.groupby(activity, sort=False, dropna=False).ffill()
+    stops = (activity_state == "STOP") & starts.notna()
+    return pd.DataFrame(
+        {
+            "Activity": activity[stops].to_numpy(),
+            "Start": starts[stops].to_numpy(),
+            "Stop": timestamp[stops].to_numpy(),
+        }
+    )
+
+
+def _get_line(segments, y_val):
+    """Get the x and y of the line segments, separated by None."""
+    start = segments["Start"].astype(object).to_numpy()
+    stop = segments["Stop"].astype(object).to_numpy()
+    y_val = np.broadcast_to(np.asarray(y_val, dtype=object), start.shape)
+    none = np.full(start.shape, None, dtype=object)
+    x = np.column_stack([start, start, stop, stop, stop]).ravel()
+    y = np.column_stack([y_val, y_val, y_val, y_val, none]).ravel()
+    return list(x), list(y)
+
+
 def get_segments(df, activity, y_val):
     """Extract 'start' and 'stop' of activities from log."""
-    x = []
-    y = []
-    start = 0
-    for i in range(len(df)):
-        if "START" in df["activity_state"][i] and df["log_string"][i] == activity:
-            start = df.index[i]
-        elif "STOP" in df["activity_state"][i] and df["log_string"][i] == activity:
-            x.extend((start, start, df.index[i], df.index[i], df.index[i]))
-            y.extend((y_val, y_val, y_val, y_val, None))
-    return x, y
+    index = df.index.to_series(index=pd.RangeIndex(len(df)))
+    segments = _pair_segments(
+        df["log_string"].reset_index(drop=True),
+        index,
+        df["activity_state"].reset_index(drop=True),
+    )
+    return _get_line(segments[segments["Activity"] == activity], y_val)
+
+
+def _get_vessel_segments(vessel, activities):
+    df = get_log_dataframe(vessel, activities)
+    return _pair_segments(df["Activity"], df["Timestamp"], df["ActivityState"])
+
+
+def get_segment_table(vessels, activities=None):
+    """
+    Get the segments of the activities of the vessels in a pandas dataframe.
+
+    Every row is an activity of a vessel between its START and STOP, with the
+    columns Vessel, Activity, Start and Stop. The ActivityID is replaced by the name
+    of the activity if it is found in activities. Vessels without log entries are
+    left out.
+    """
+    tables = []
+    for vessel in vessels:
+        if len(vessel.log_backend) > 0:
+            segments = _get_vessel_segments(vessel, activities or [])
+            segments.insert(0, "Vessel", vessel.name)
+            tables.append(segments)
+
+    if len(tables) == 0:
+        return pd.DataFrame(columns=["Vessel", "Activity", "Start", "Stop"])
+    return pd.concat(tables, ignore_index=True)
 
 
 def get_gantt_chart(
@@ -47,9 +102,11 @@ def get_gantt_chart(
     id_map = {ves.id: ves.name for ves in vessels}
 
     if activities is None:
-        activities = []
+        # every activity gets one trace, also when it is logged by several vessels
+        activities = {}
         for obj in vessels:
-            activities.extend(set(obj.log["ActivityID"]))
+            activities.update(dict.fromkeys(obj.log["ActivityID"]))
+        activities = list(activities)
 
     if colors is None:
         C = get_colors(len(activities))
@@ -57,39 +114,24 @@ def get_gantt_chart(
         for i in range(len(activities)):
             colors[i] = f"rgb({C[i][0]},{C[i][1]},{C[i][2]})"
 
-    # organise logdata into 'dataframes'
-    dataframes = []
-    names = []
+    # pair the START and STOP of all activities at once, per vessel
+    tables = []
     for vessel in vessels:
-        if len(vessel.log["Timestamp"]) > 0:
-            df = get_log_dataframe(vessel, vessels).rename(
-                columns={
-                    "Activity": "log_string",
-                    "ActivityState": "activity_state",
-                }
-            )
-            df = (
-                df.drop(df[df.activity_state == "WAIT_START"].index)
-                .drop(df[df.activity_state == "WAIT_STOP"].index)
-                .set_index("Timestamp", drop=False)
-            )
-
-            dataframes.append(df)
-            names.append(vessel.name)
-
-    df = dataframes[0]
+        if len(vessel.log_backend) > 0:
+            segments = _get_vessel_segments(vessel, vessels)
+            segments["y"] = -len(tables) if y_scale == "numbers" else vessel.name
+            tables.append(segments)
+    segments = dict(list(pd.concat(tables).groupby("Activity", sort=False)))
 
     # prepare traces for each of the activities
     traces = []
     for i, activity in enumerate(activities):
         activity = id_map.get(activity, activity)
-        x_combined = []
-        y_combined = []
-        for k, df in enumerate(dataframes):
-            y_val = -k if y_scale == "numbers" else names[k]
-            x, y = get_segments(df, activity=activity, y_val=y_val)
-            x_combined.extend(x)
-            y_combined.extend(y)
+        x_combined, y_combined = [], []
+        if activity in segments:
+            x_combined, y_combined = _get_line(
+                segments[activity], segments[activity]["y"]
+            )
         traces.append(
             go.Scatter(
                 name=activity,
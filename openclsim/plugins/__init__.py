@@ -1,11 +1,22 @@
 """Directory for the simulation activity plugins."""
 
 from .delay import DelayPlugin, HasDelayPlugin
-from .weather import HasWeatherPluginActivity, WeatherCriterion
+from .weather import (
+    HasWeatherPluginActivity,
+    WeatherCriterion,
+    WeatherWindowStore,
+    read_metocean_npy,
+    window_store,
+    write_metocean_npy,
+)
 
 __all__ = [
     "HasWeatherPluginActivity",
     "WeatherCriterion",
+    "WeatherWindowStore",
+    "window_store",
+    "read_metocean_npy",
+    "write_metocean_npy",
     "HasDelayPlugin",
     "DelayPlugin",
 ]
@@ -1,5 +1,11 @@
 """Directory for the weather plugin."""
 
+import weakref
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from urllib.parse import quote, unquote
+
 import numpy as np
 
 import openclsim.model as model
@@ -57,8 +63,181 @@ class WeatherCriterion:
         self.window_delay = window_delay
 
 
+def write_metocean_npy(metocean_df, directory, columns=None):
+    """
+    Write the columns of the metocean data to a directory with a .npy file per column.
+
+    Parameters
+    ----------
+    metocean_df
+        The metocean data with a ts column and a column per condition
+    directory
+        The directory in which the .npy files are written
+    columns
+        The columns to write, by default all columns
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for column in metocean_df.columns if columns is None else columns:
+        np.save(
+            directory / f"{quote(column, safe=' []')}.npy",
+            np.asarray(metocean_df[column], dtype=float),
+        )
+
+
+class MetoceanData(dict):
+    """Dictionary of the metocean columns, which can be weakly referenced."""
+
+
+def read_metocean_npy(directory, columns=None):
+    """
+    Read the metocean data written by write_metocean_npy as memory-mapped arrays.
+
+    The arrays are not loaded into memory, so simulations in parallel processes
+    share the pages of the files through the cache of the operating system. The
+    result can be used as the metocean_df of the weather plugin.
+
+    Parameters
+    ----------
+    directory
+        The directory with a .npy file per column
+    columns
+        The columns to read, by default all columns in the directory
+    """
+    paths = {unquote(path.stem): path for path in Path(directory).glob("*.npy")}
+    if columns is not None:
+        paths = {column: paths[column] for column in columns}
+
+    return MetoceanData(
+        (column, np.load(path, mmap_mode="r")) for column, path in paths.items()
+    )
+
+
+class WeatherWindowStore:
+    """
+    Process wide store of the computed weather windows.
+
+    The windows are stored per dataset and criterion parameters, so identical criteria
+    on the same metocean dataset share one computed window index. The store only
+    holds a weak reference to the datasets: the windows of a dataset are evicted as
+    soon as it is garbage collected, which makes the identity of the dataset a safe
+    part of the key without keeping the dataset alive. Datasets which can not be
+    weakly referenced, such as a plain dict, are kept alive by their windows until
+    these are evicted.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of window indexes that are stored, the least recently used
+        window index is evicted first.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._windows = OrderedDict()
+        self._datasets = {}
+
+    @staticmethod
+    def key(metocean_df, criterion):
+        return (
+            id(metocean_df),
+            criterion.condition,
+            criterion.minimum,
+            criterion.maximum,
+            criterion.window_length,
+            criterion.window_delay,
+        )
+
+    def get(self, metocean_df, criterion, compute):
+        """Return the stored window index or compute it with compute()."""
+        key = self.key(metocean_df, criterion)
+
+        if key in self._windows:
+            self.hits += 1
+            self._windows.move_to_end(key)
+            return self._windows[key][0]
+
+        self.misses += 1
+        window_index = compute()
+        owner = None
+        if id(metocean_df) not in self._datasets:
+            try:
+                self._datasets[id(metocean_df)] = weakref.ref(
+                    metocean_df, partial(self._evict, id(metocean_df))
+                )
+            except TypeError:
+                owner = metocean_df
+        self._windows[key] = (window_index, owner)
+        while len(self._windows) > self.maxsize:
+            self._windows.popitem(last=False)
+        return window_index
+
+    def _evict(self, dataset_id, reference):
+        """Remove the windows of a dataset which has been garbage collected."""
+        if self._datasets.get(dataset_id) is reference:
+            del self._datasets[dataset_id]
+        for key in [key for key in self._windows if key[0] == dataset_id]:
+            del self._windows[key]
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self._windows.clear()
+        self._datasets.clear()
+
+    def __len__(self):
+        """Return the number of stored window indexes."""
+        return len(self._windows)
+
+
+window_store = WeatherWindowStore()
+
+
+def intersect_windows(windows):
+    """
+    Return the starts and ends of the windows which are common to all criteria.
+
+    Parameters
+    ----------
+    windows
+        List with a tuple of sorted, non-overlapping window starts and window ends
+        per criterion.
+    """
+    if len(windows) == 1:
+        return windows[0]
+
+    steps = np.concatenate(
+        [np.full(len(starts), 1) for starts, _ in windows]
+        + [np.full(len(ends), -1) for _, ends in windows]
+    )
+    times = np.concatenate(
+        [starts for starts, _ in windows] + [ends for _, ends in windows]
+    )
+
+    # sweep over all the bounds, at equal times a window opens before another closes
+    order = np.lexsort((-steps, times))
+    times = times[order]
+    nr_open = np.cumsum(steps[order])
+
+    common = np.flatnonzero(nr_open == len(windows))
+    return times[common], times[common + 1]
+
+
 class HasWeatherPluginActivity:
-    """Mixin forActivity to initialize WeatherPluginActivity."""
+    """
+    Mixin forActivity to initialize WeatherPluginActivity.
+
+    Parameters
+    ----------
+    metocean_criteria
+        A WeatherCriterion or a list of WeatherCriterion which all have to be met
+    metocean_df
+        The metocean data with a ts column and a column per condition, either as
+        pandas DataFrame or as mapping of the columns to (memory-mapped) arrays
+    """
 
     def __init__(self, metocean_criteria, metocean_df, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -78,12 +257,29 @@ class HasWeatherPluginActivity:
 
 
 class WeatherPluginActivity(model.AbstractPluginClass):
-    """Mixin for MoveActivity to initialize TestPluginMoveActivity."""
+    """
+    Mixin for MoveActivity to initialize TestPluginMoveActivity.
+
+    The weather_criteria can be a single WeatherCriterion or a list of criteria
+    which all have to be met. The workable windows of every criterion are computed
+    once, on first use, and stored as sorted arrays of start and end times. The
+    windows common to all criteria follow from an intersection of these arrays, so
+    a weather check is a single binary search. The window indexes of the individual
+    criteria are shared between plugins through the window_store.
+    """
+
+    def __init__(self, weather_criteria=None, metocean_df=None, store=None):
+        if isinstance(weather_criteria, WeatherCriterion):
+            self.criteria = [weather_criteria]
+        else:
+            self.criteria = list(weather_criteria)
+        assert len(self.criteria) > 0
+        assert all(isinstance(crit, WeatherCriterion) for crit in self.criteria)
 
-    def __init__(self, weather_criteria=None, metocean_df=None):
-        assert isinstance(weather_criteria, WeatherCriterion)
         self.weather_criteria = weather_criteria
         self.metocean_df = metocean_df
+        self.window_store = window_store if store is None else store
+        self._window_index = None
 
     def pre_process(self, env, activity_log, activity, *args, **kwargs):
         if self.weather_criteria is not None:
@@ -104,95 +300,107 @@ class WeatherPluginActivity(model.AbstractPluginClass):
         else:
             return {}
 
+    @property
+    def window_index(self):
+        """Return the window starts, the window ends and the duration of the dataset."""
+        if self._window_index is None:
+            window_indexes = [
+                self.window_store.get(
+                    self.metocean_df,
+                    criterion,
+                    partial(self._compute_window_index, criterion),
+                )
+                for criterion in self.criteria
+            ]
+            if len(window_indexes) == 1:
+                self._window_index = window_indexes[0]
+            else:
+                starts, ends = intersect_windows(
+                    [(starts, ends) for starts, ends, _ in window_indexes]
+                )
+                self._window_index = (starts, ends, window_indexes[0][2])
+        return self._window_index
+
+    def _compute_window_index(self, criterion):
+        res = self.process_data(criterion)
+        windows = np.array(res["windows"], dtype=float).reshape(-1, 2)
+        return (
+            windows[:, 0],
+            windows[:, 1],
+            res["dataset_stop"] - res["dataset_start"],
+        )
+
     def check_constraint(self, start_time):
-        res = self.process_data(self.weather_criteria)
-        windows = np.array(res["windows"])
-        ts_start = res["dataset_start"]
-        ts_stop = res["dataset_stop"]
+        starts, ends, period = self.window_index
 
-        filter_windows = windows[windows[:, 1] >= start_time]
-        i = 0
-        while len(filter_windows) < 1 and i < 10:
-            dt = i * (ts_stop - ts_start)
-            filter_windows = windows[windows[:, 1] >= start_time - dt]
-            i = i + 1
+        # if no window is left in the dataset, the dataset is repeated
+        for i in range(10):
+            index = np.searchsorted(ends, start_time - i * period, side="left")
+            if index < len(ends):
+                return [starts[index], ends[index]]
 
-        return list(filter_windows[0])
+        names = ", ".join(criterion.name for criterion in self.criteria)
+        raise ValueError(f"No workable window found for weather criteria {names}.")
 
-    def process_data(self, criterion) -> None:
+    def process_data(self, criterion):
+        """
+        Determine the workable windows of a criterion.
 
+        The metocean data can be a pandas DataFrame or any mapping of the column names
+        to arrays, such as the memory-mapped arrays of read_metocean_npy. The columns
+        are only read and not copied.
+        """
         col = criterion.condition
-        orig_data = self.metocean_df.copy()
+        ts = np.asarray(self.metocean_df["ts"], dtype=float)
+        values = np.asarray(self.metocean_df[col], dtype=float)
 
         # get start and stop date of the data set
-        ts_start = min(orig_data["ts"])
-        ts_stop = max(orig_data["ts"])
-
-        data = orig_data.copy()
-        data["ts"] = data["ts"]
-        data["cur"] = True
-        data["prev_ts"] = data.ts.shift(1)
+        ts_start = ts.min()
+        ts_stop = ts.max()
 
         if criterion.maximum is not None:
-            threshold = {col: criterion.maximum}
-
-            if orig_data[col].max() < threshold[col]:
-                threshold[col] = orig_data[col].max() - 0.0001
-
-            data["cur"] = data["cur"] & (data[col] <= threshold[col])
-            data[f"{col}_prev"] = data[col].shift(1)
-
-            data[f"{col}_inter"] = data["ts"]
+            threshold = criterion.maximum
+            if values.max() < threshold:
+                threshold = values.max() - 0.0001
+            workable = values <= threshold
         else:
-            threshold = {col: criterion.minimum}
-
-            if orig_data[col].min() > threshold[col]:
-                threshold[col] = orig_data[col].min() + 0.0001
-
-            data["cur"] = data["cur"] & (data[col] >= threshold[col])
-            data[f"{col}_prev"] = data[col].shift(1)
-            data[f"{col}_inter"] = data["ts"]
-
-        data["prev"] = data.cur.shift(1)
-        data = data[1:]
-        data = data[data.cur ^ data.prev]
-        data["type"] = "start"
-
-        data[f"{col}_inter"] = data.ts
-        data2 = data.loc[(data[col] - data[f"{col}_prev"]) != 0]
-        data2[f"{col}_inter"] = data2.prev_ts + (data2.ts - data2.prev_ts) * (
-            threshold[col] - data2[f"{col}_prev"]
-        ) / (data2[col] - data2[f"{col}_prev"])
+            threshold = criterion.minimum
+            if values.min() > threshold:
+                threshold = values.min() + 0.0001
+            workable = values >= threshold
+
+        # the moments at which the workability changes
+        changes = np.flatnonzero(workable[1:] ^ workable[:-1]) + 1
+        change_ts = ts[changes]
         if criterion.maximum is not None:
-            data.loc[data[col] > threshold[col], "type"] = "end"
+            is_start = ~(values[changes] > threshold)
         else:
-            data.loc[data[col] < threshold[col], "type"] = "end"
-
-        columns = [f"{col}_inter"]
-        data["ts_inter"] = np.maximum.reduce(data[columns].values, axis=1)
-        data["end_inter"] = data.ts_inter.shift(-1)
-
-        if data.iloc[0]["type"] == "end":
-            data.iloc[0, data.columns.get_loc("type")] = "start"
-            data.iloc[0, data.columns.get_loc("end_inter")] = data.iloc[0]["ts_inter"]
-            data.iloc[0, data.columns.get_loc("ts_inter")] = orig_data.iloc[0]["ts"]
-        if data.iloc[-1]["type"] == "start":
-            data.iloc[-1, data.columns.get_loc("end_inter")] = orig_data.iloc[-1]["ts"]
-
-        data.rename(columns={"ts_inter": "start_inter"}, inplace=True)
-
-        data = data[data["type"] == "start"][["start_inter", "end_inter"]]
-
-        data = data[data["end_inter"] - data["start_inter"] > criterion.window_length]
-        data["end_inter"] = (
-            data["end_inter"] - criterion.window_length - criterion.window_delay
+            is_start = ~(values[changes] < threshold)
+
+        # a window lasts until the next change of the workability
+        window_end = np.append(change_ts[1:], np.nan)
+        window_start = change_ts.copy()
+
+        if len(changes) > 0:
+            if not is_start[0]:
+                is_start[0] = True
+                window_end[0] = window_start[0]
+                window_start[0] = ts[0]
+            if is_start[-1]:
+                window_end[-1] = ts[-1]
+
+        window_start = window_start[is_start]
+        window_end = window_end[is_start]
+
+        long_enough = window_end - window_start > criterion.window_length
+        window_end = (
+            window_end[long_enough] - criterion.window_length - criterion.window_delay
         )
-        data["start_inter"] = data["start_inter"] - criterion.window_delay
-        windows = [list(data.iloc[d]) for d in range(len(data))]
+        window_start = window_start[long_enough] - criterion.window_delay
 
         result = {
             "dataset_start": ts_start,
             "dataset_stop": ts_stop,
-            "windows": windows,
+            "windows": np.column_stack([window_start, window_end]),
         }
         return result
@@ -0,0 +1,189 @@
+"""Test module for the compiled activity trees."""
+
+import pytest
+import simpy
+
+import openclsim.core as core
+import openclsim.model as model
+
+from .test_fast_forward import _single_runs
+
+
+def _get_logs(objects):
+    names = {obj.id: obj.name for obj in objects}
+    logs = []
+    for obj in objects:
+        log = obj.log
+        logs.append(
+            {
+                "Timestamp": log["Timestamp"],
+                "ActivityID": [names[id_] for id_ in log["ActivityID"]],
+                "ActivityState": log["ActivityState"],
+                "ActivityLabel": [
+                    {key: names.get(value, value) for key, value in label.items()}
+                    for label in log["ActivityLabel"]
+                ],
+            }
+        )
+    return logs
+
+
+def _nested_tree(compiled):
+    env = simpy.Environment()
+    registry = {}
+    reporting_activity = model.BasicActivity(
+        env=env, name="Reporting activity", registry=registry, duration=0
+    )
+
+    def basic(name, duration, **kwargs):
+        return model.BasicActivity(
+            env=env,
+            name=name,
+            registry=registry,
+            duration=duration,
+            additional_logs=[reporting_activity],
+            **kwargs,
+        )
+
+    parallel = model.ParallelActivity(
+        env=env,
+        name="Parallel activity",
+        registry=registry,
+        sub_processes=[
+            basic("Basic activity 1", 10),
+            basic("Basic activity 2", 5),
+            basic(
+                "Basic activity 3",
+                1,
+                start_event={
+                    "type": "activity",
+                    "state": "done",
+                    "name": "Basic activity 2",
+                },
+            ),
+        ],
+    )
+    repeat = model.RepeatActivity(
+        env=env,
+        name="Repeat activity",
+        registry=registry,
+        sub_processes=[
+            model.SequentialActivity(
+                env=env,
+                name="Sequential activity",
+                registry=registry,
+                sub_processes=[basic("Basic activity 4", 2), parallel],
+            )
+        ],
+        repetitions=3,
+    )
+    activity = model.SequentialActivity(
+        env=env,
+        name="Top activity",
+        registry=registry,
+        sub_processes=[basic("Basic activity 5", 1), repeat],
+    )
+
+    if compiled:
+        model.compile_processes([activity])
+    else:
+        model.register_processes([activity])
+    env.run()
+
+    objects = [reporting_activity, *model.get_subprocesses(activity)]
+    return env, objects
+
+
+def test_compiled_single_run():
+    """Test that the compiled single runs give the same logs as the activity tree."""
+    for nr_vessels, fast_forward in [(1, False), (2, False), (1, True)]:
+        env, objects = _single_runs(nr_vessels=nr_vessels)
+        compiled_env, compiled_objects = _single_runs(
+            nr_vessels=nr_vessels,
+            fast_forward=fast_forward,
+            register=model.compile_processes,
+        )
+
+        assert abs(compiled_env.now - env.now) < 1e-3
+        assert _get_logs(compiled_objects) == _get_logs(objects)
+
+
+def test_compiled_nested_activities():
+    """Test the compilation of nested sequential, parallel and repeat activities."""
+    env, objects = _nested_tree(compiled=False)
+    compiled_env, compiled_objects = _nested_tree(compiled=True)
+
+    assert compiled_env.now == env.now == 1 + 3 * (2 + 10)
+    assert _get_logs(compiled_objects) == _get_logs(objects)
+
+
+def test_compile_unknown_structure():
+    """Test that an unknown structural activity can not be compiled."""
+    env = simpy.Environment()
+    Structure = type("Structure", (model.GenericActivity,), {})
+    activity = Structure(env=env, name="Structure", registry={})
+    activity.sub_processes = []
+
+    with pytest.raises(ValueError):
+        model.CompiledActivity(activity)
+
+
+def test_compiled_resources_are_released():
+    """Test that a compiled activity releases the resources it requested."""
+    env = simpy.Environment()
+    Vessel = type(
+        "Vessel",
+        (core.Identifiable, core.Log, core.Movable, core.HasResource),
+        {},
+    )
+    site = type("Site", (core.Identifiable, core.Log, core.Locatable), {})(
+        env=env, name="site", geometry={"type": "Point", "coordinates": [4.3, 52.1]}
+    )
+    vessel = Vessel(
+        env=env,
+        name="vessel",
+        geometry={"type": "Point", "coordinates": [4.2, 52.1]},
+        v=5,
+    )
+    activity = model.MoveActivity(
+        env=env, name="Move activity", registry={}, mover=vessel, destination=site
+    )
+    model.compile_processes(activity)
+    env.run()
+
+    assert vessel.resource.count == 0
+    assert activity.log["ActivityState"] == ["START", "STOP"]
+
+
+def test_compiled_activities_are_registered():
+    """Test that activities registered before the compilation can wait for the tree."""
+    logs = []
+    for register in [model.register_processes, model.compile_processes]:
+        env = simpy.Environment()
+        registry = {}
+        waiting = model.BasicActivity(
+            env=env,
+            name="Waiting activity",
+            registry=registry,
+            duration=1,
+            start_event={"type": "activity", "state": "done", "name": "Basic 1"},
+        )
+        activity = model.SequentialActivity(
+            env=env,
+            name="Sequential activity",
+            registry=registry,
+            sub_processes=[
+                model.BasicActivity(
+                    env=env, name=f"Basic {i}", registry=registry, duration=i
+                )
+                for i in range(1, 3)
+            ],
+        )
+        model.register_processes([waiting])
+        register([activity])
+        env.run()
+
+        assert env.now == 3
+        logs.append(_get_logs([waiting, *model.get_subprocesses(activity)]))
+
+    assert logs[0] == logs[1]
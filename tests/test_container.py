@@ -1,5 +1,6 @@
 """Test module for the openclsim container."""
 
+import pytest
 import simpy
 
 from openclsim import core
@@ -106,3 +107,71 @@ def test_empty_full_events():
 
     env.process(process())
     env.run()
+
+
+def test_multiple_container_ids():
+    """Test the levels and capacities of a container with multiple ids."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env, store_capacity=2)
+    container.initialize_container(
+        [
+            {"id": "MP", "capacity": 10, "level": 2},
+            {"id": "TP", "capacity": 4, "level": 0},
+        ]
+    )
+
+    def process():
+        yield from container.put(3, id_="TP")
+        yield from container.get(1, id_="MP_reservations")
+
+    env.process(process())
+    env.run()
+
+    assert container.container_list == ["MP", "TP"]
+    assert container.get_level("MP") == 2
+    assert container.get_level("MP_reservations") == 1
+    assert container.get_level("TP") == 3
+    assert container.get_capacity("TP") == 4
+    assert container.get_level("unknown") == 0
+    assert container.get_capacity("unknown") == 0
+    assert container.items == [
+        {"id": "MP", "capacity": 10, "level": 2},
+        {"id": "MP_reservations", "capacity": 10, "level": 1},
+        {"id": "TP", "capacity": 4, "level": 3},
+        {"id": "TP_reservations", "capacity": 4, "level": 0},
+    ]
+
+    with pytest.raises(AssertionError):
+        container.initialize_container([{"id": "PP", "capacity": 1, "level": 0}])
+
+
+def test_container_event_thresholds():
+    """Test that only crossed thresholds trigger and processed events are evicted."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env)
+    container.initialize_container([{"id": "default", "capacity": 10, "level": 5}])
+
+    def process():
+        above_5 = container.get_container_event(level=5, operator="gt")
+        at_least_6 = container.get_container_event(level=6, operator="ge")
+        at_least_8 = container.get_container_event(level=8, operator="ge")
+        below_5 = container.get_container_event(level=5, operator="lt")
+        at_most_4 = container.get_container_event(level=4, operator="le")
+
+        yield from container.put(1)
+        assert above_5.triggered and at_least_6.triggered
+        assert not at_least_8.triggered
+
+        yield from container.get(2)
+        assert below_5.triggered and at_most_4.triggered
+        assert not at_least_8.triggered
+
+        # only the event that nobody has reached yet is still registered
+        yield env.timeout(1)
+        assert list(container._container_events) == [("default", 8, "ge")]
+        assert len(container._thresholds["default"]) == 1
+
+        assert container.get_container_event(level=6, operator="lt").triggered
+
+    env.process(process())
+    env.run()
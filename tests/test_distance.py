@@ -0,0 +1,101 @@
+"""Test module for the distances between the simulation objects."""
+
+import pyproj
+import pytest
+import shapely.geometry
+import simpy
+
+from openclsim import core
+
+
+def test_distance_cache():
+    """Test that repeated distances are served from the cache."""
+    cache = core.DistanceCache(maxsize=2)
+    wgs84 = pyproj.Geod(ellps="WGS84")
+    _, _, expected = wgs84.inv(4.18055556, 52.18664444, 4.25222222, 52.11428333)
+
+    origin = (4.18055556, 52.18664444)
+    destination = (4.25222222, 52.11428333)
+    assert cache.distance(origin, destination) == pytest.approx(expected)
+    assert cache.distance(origin, destination) == pytest.approx(expected)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    # coordinates are rounded to form the key of the cache
+    cache.distance((4.180555561, 52.18664444), destination)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # the least recently used distance is evicted
+    cache.distance(destination, origin)
+    cache.distance((0, 0), (1, 1))
+    assert len(cache) == 2
+    cache.distance(origin, destination)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+def test_locatable_is_at():
+    """Test is_at of locatables with shapely and geojson geometries."""
+    site = core.Locatable(shapely.geometry.Point(4.18055556, 52.18664444))
+    nearby = core.Locatable({"type": "Point", "coordinates": [4.1806, 52.1866]})
+    far = core.Locatable(shapely.geometry.Point(4.25222222, 52.11428333))
+
+    assert site.is_at(nearby)
+    assert nearby.is_at(site)
+    assert not site.is_at(far)
+    assert site.is_at(far, tolerance=10_000)
+
+
+def test_distance_models():
+    """Test the shared geodesic engine and the haversine distance model."""
+    site_a = core.Locatable(shapely.geometry.Point(4.18055556, 52.18664444))
+    site_b = core.Locatable(shapely.geometry.Point(4.25222222, 52.11428333))
+    assert site_a.wgs84 is site_b.wgs84
+
+    geodesic = core.GeodesicDistance()
+    haversine = core.HaversineDistance()
+    args = (4.18055556, 52.18664444, 4.25222222, 52.11428333)
+    assert haversine(*args) == pytest.approx(geodesic(*args), rel=5e-3)
+
+    cache = core.DistanceCache()
+    cache.distance(args[:2], args[2:])
+    cache.set_model(haversine)
+    assert len(cache) == 0
+    assert cache.distance(args[:2], args[2:]) == haversine(*args)
+
+
+def test_distance_matrix():
+    """Test the precomputed distances between a set of sites."""
+    env = simpy.Environment()
+    Site = type("Site", (core.Identifiable, core.Locatable), {})
+    sites = [
+        Site(name=f"site {i}", geometry=shapely.geometry.Point(4 + 0.1 * i, 52))
+        for i in range(4)
+    ]
+    matrix = core.DistanceMatrix(sites)
+    geodesic = core.GeodesicDistance()
+
+    assert matrix.matrix.shape == (4, 4)
+    for origin in sites:
+        for destination in sites:
+            expected = geodesic(
+                origin.geometry.x,
+                origin.geometry.y,
+                destination.geometry.x,
+                destination.geometry.y,
+            )
+            assert matrix.distance(origin, destination) == pytest.approx(expected)
+    assert matrix.get_distance(shapely.geometry.Point(0, 0), sites[0].geometry) is None
+
+    far_away = [(sites[0], sites[3]), (sites[3], sites[0])]
+    assert matrix.unreachable(max_distance=15_000) == far_away
+    assert matrix.unreachable() == []
+
+    Vessel = type("Vessel", (core.Identifiable, core.Log, core.Movable), {})
+    vessel = Vessel(
+        env=env, name="vessel", geometry=sites[0].geometry, distance_matrix=matrix
+    )
+    assert vessel.sailing_duration(vessel.geometry, sites[2], 1) == matrix.distance(
+        sites[0], sites[2]
+    )
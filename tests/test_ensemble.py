@@ -0,0 +1,71 @@
+"""Test module for the Monte Carlo ensembles."""
+
+import numpy as np
+import pandas as pd
+import simpy
+
+import openclsim.batch as batch
+import openclsim.model as model
+
+
+def build_scenario(seed):
+    """Build a sequence of basic activities with random durations."""
+    rng = np.random.default_rng(seed)
+    env = simpy.Environment()
+    registry = {}
+
+    sub_processes = [
+        model.BasicActivity(
+            env=env,
+            name=f"Basic activity {i}",
+            registry=registry,
+            duration=rng.uniform(10, 20),
+        )
+        for i in range(3)
+    ]
+    activity = model.SequentialActivity(
+        env=env,
+        name="Sequential activity",
+        registry=registry,
+        sub_processes=sub_processes,
+    )
+    model.register_processes([activity])
+    return env, [activity, *sub_processes]
+
+
+def test_run_ensemble():
+    """Test that the ensemble gives the same results in a process pool."""
+    seeds = [1, 2, 3, 4]
+
+    serial = batch.run_ensemble(build_scenario, seeds, max_workers=1)
+    parallel = batch.run_ensemble(build_scenario, seeds, max_workers=2)
+
+    assert len(serial) == 4 * len(seeds)
+    assert list(serial["Seed"].unique()) == seeds
+    assert list(serial.columns) == [
+        "Object",
+        "ObjectID",
+        "Start",
+        "Stop",
+        "Entries",
+        "SimulationTime",
+        "Seed",
+    ]
+    pd.testing.assert_frame_equal(
+        serial.drop(columns="ObjectID"), parallel.drop(columns="ObjectID")
+    )
+
+    simulation_times = serial.groupby("Seed")["SimulationTime"].first()
+    assert simulation_times.nunique() == len(seeds)
+    assert (simulation_times > 30).all() and (simulation_times < 60).all()
+
+
+def test_run_member():
+    """Test that a member of the ensemble can be reproduced from its seed."""
+
+    def summarize(env, simulation_objects):
+        return pd.DataFrame({"SimulationTime": [env.now]})
+
+    first = batch.run_member(build_scenario, 7, summarize=summarize)
+    second = batch.run_member(build_scenario, 7, summarize=summarize)
+    pd.testing.assert_frame_equal(first, second)
@@ -0,0 +1,58 @@
+"""Test module for the compiled expressions."""
+
+import pytest
+import simpy
+
+import openclsim.core as core
+import openclsim.model as model
+
+
+def test_compiled_expressions():
+    """Test that compiled expressions are reused until their events are renewed."""
+    env = simpy.Environment()
+    registry = {}
+    Site = type("Site", (core.Identifiable, core.HasContainer), {})
+    site = Site(env=env, name="site", capacity=10, level=0)
+
+    first = model.BasicActivity(env=env, name="first", registry=registry, duration=5)
+    second = model.BasicActivity(env=env, name="second", registry=registry, duration=5)
+    model.register_processes([first, second])
+
+    expr = {
+        "or": [
+            {"type": "activity", "state": "done", "name": "first"},
+            {"type": "container", "concept": site, "state": "full"},
+        ]
+    }
+    event = second.parse_expression(expr)
+    assert second.compile_expression(expr) is second.compile_expression(dict(expr))
+    assert second.parse_expression(dict(expr)) is event
+
+    # the event is only renewed when the process of the activity is replaced
+    first.register_process()
+    assert second.parse_expression(expr) is not event
+
+    activity_event = second.parse_expression(
+        [{"type": "activity", "state": "done", "name": "first"}]
+    )
+    env.run()
+    assert activity_event.triggered
+    assert env.now == 5
+
+
+def test_invalid_expressions():
+    """Test the errors of invalid expressions."""
+    env = simpy.Environment()
+    registry = {}
+    activity = model.BasicActivity(
+        env=env, name="activity", registry=registry, duration=5
+    )
+
+    with pytest.raises(ValueError):
+        activity.parse_expression("done")
+    with pytest.raises(ValueError):
+        activity.parse_expression({"type": "activity", "state": "started"})
+    with pytest.raises(Exception, match="No activity found"):
+        activity.parse_expression({"type": "activity", "state": "done", "name": "x"})
+    with pytest.raises(TypeError):
+        model.expression.Expression()
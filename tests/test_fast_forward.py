@@ -0,0 +1,245 @@
+"""Test module for the fast-forward of identical cycles."""
+
+import pytest
+import shapely.geometry
+import simpy
+
+import openclsim.core as core
+import openclsim.model as model
+
+
+def _single_runs(nr_vessels=1, fast_forward=False, register=model.register_processes):
+    env = simpy.Environment()
+    registry = {}
+
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    TransportProcessingResource = type(
+        "TransportProcessingResource",
+        (
+            core.Identifiable,
+            core.Log,
+            core.ContainerDependentMovable,
+            core.Processor,
+            core.LoadingFunction,
+            core.UnloadingFunction,
+            core.HasResource,
+        ),
+        {},
+    )
+
+    location_from_site = shapely.geometry.Point(4.18055556, 52.18664444)
+    location_to_site = shapely.geometry.Point(4.25222222, 52.11428333)
+    from_site = Site(
+        env=env,
+        name="Winlocatie",
+        geometry=location_from_site,
+        capacity=25_500,
+        level=25_500,
+    )
+    to_site = Site(
+        env=env,
+        name="Dumplocatie",
+        geometry=location_to_site,
+        capacity=25_500,
+        level=0,
+    )
+
+    objects = [from_site, to_site]
+    activities = []
+    for i in range(nr_vessels):
+        hopper = TransportProcessingResource(
+            env=env,
+            name=f"Hopper {i}",
+            geometry=location_from_site,
+            capacity=1000,
+            compute_v=lambda x: 10 + 2 * x,
+            loading_rate=1,
+            unloading_rate=5,
+        )
+        single_run, while_activity = model.single_run_process(
+            name=f"single_run {i}",
+            registry=registry,
+            env=env,
+            origin=from_site,
+            destination=to_site,
+            mover=hopper,
+            loader=hopper,
+            unloader=hopper,
+            fast_forward=fast_forward,
+        )
+        objects += [hopper, while_activity, *single_run]
+        activities.append(while_activity)
+
+    register(activities)
+    env.run()
+    return env, objects
+
+
+def _assert_same_logs(objects, other_objects):
+    for obj, other in zip(objects, other_objects):
+        log, other_log = obj.log, other.log
+        assert len(log["Timestamp"]) == len(other_log["Timestamp"])
+        assert log["ActivityState"] == other_log["ActivityState"]
+        for t, other_t in zip(log["Timestamp"], other_log["Timestamp"]):
+            assert abs((t - other_t).total_seconds()) < 1e-3
+        for state, other_state in zip(log["ObjectState"], other_log["ObjectState"]):
+            assert state.keys() == other_state.keys()
+            if "container level" in state:
+                assert (
+                    abs(state["container level"] - other_state["container level"])
+                    < 1e-6
+                )
+
+
+def test_fast_forward_single_run(monkeypatch):
+    """Test that the fast-forwarded cycles give the same logs as the simulation."""
+    env, objects = _single_runs()
+
+    skipped = []
+    skip = model.CycleFastForward.skip
+
+    def counting_skip(self, max_cycles):
+        nr_cycles = yield from skip(self, max_cycles)
+        skipped.append(nr_cycles)
+        return nr_cycles
+
+    monkeypatch.setattr(model.CycleFastForward, "skip", counting_skip)
+    fast_env, fast_objects = _single_runs(fast_forward=True)
+
+    # 26 cycles, of which the first two are measured and the last two simulated
+    assert sum(skipped) == 22
+    assert abs(fast_env.now - env.now) < 1e-3
+    _assert_same_logs(objects, fast_objects)
+    for obj, other in zip(objects[:3], fast_objects[:3]):
+        assert obj.container.get_level() == other.container.get_level()
+
+
+def test_fast_forward_contended():
+    """Test that no cycles are skipped while other vessels share the sites."""
+    env, objects = _single_runs(nr_vessels=2)
+    fast_env, fast_objects = _single_runs(nr_vessels=2, fast_forward=True)
+
+    assert fast_env.now == env.now
+    _assert_same_logs(objects, fast_objects)
+
+
+def test_overlapping_cycles():
+    """Test that the level ranges of a container are recorded by one cycle at a time."""
+    env = simpy.Environment()
+    Site = type("Site", (core.Identifiable, core.Log, core.HasContainer), {})
+    site = Site(env=env, name="site", capacity=10, level=5)
+    containers = [site.container]
+
+    first = model.fast_forward.Cycle(env, [site], containers)
+    second = model.fast_forward.Cycle(env, [site], containers)
+    assert first.recording and not second.recording
+
+    first.stop()
+    second.stop()
+    assert first.closed and not second.closed
+    assert site.container.level_ranges is None
+
+
+def test_fast_forward_repeat():
+    """Test the fast-forward of a RepeatActivity."""
+    logs = []
+    for fast_forward in [False, True]:
+        env = simpy.Environment()
+        registry = {}
+        reporting_activity = model.BasicActivity(
+            env=env,
+            name="Reporting activity",
+            registry=registry,
+            duration=0,
+        )
+        sequence = model.SequentialActivity(
+            env=env,
+            name="Sequential activity",
+            registry=registry,
+            sub_processes=[
+                model.BasicActivity(
+                    env=env,
+                    name=f"Basic activity {i}",
+                    registry=registry,
+                    duration=i + 1,
+                    additional_logs=[reporting_activity],
+                )
+                for i in range(3)
+            ],
+        )
+        activity = model.RepeatActivity(
+            env=env,
+            name="Repeat activity",
+            registry=registry,
+            sub_processes=[sequence],
+            repetitions=100,
+            fast_forward=fast_forward,
+        )
+        model.register_processes([activity])
+        env.run()
+
+        assert env.now == 600
+        logs.append([activity, sequence, reporting_activity])
+
+    _assert_same_logs(*logs)
+
+
+@pytest.mark.parametrize(
+    "register", [model.register_processes, model.compile_processes]
+)
+def test_fast_forward_nested_repeat(monkeypatch, register):
+    """Test that every run of a nested fast-forwarded loop skips its cycles."""
+    skipped = []
+    skip = model.CycleFastForward.skip
+
+    def counting_skip(self, max_cycles):
+        nr_cycles = yield from skip(self, max_cycles)
+        skipped.append(nr_cycles)
+        return nr_cycles
+
+    monkeypatch.setattr(model.CycleFastForward, "skip", counting_skip)
+
+    env = simpy.Environment()
+    registry = {}
+    Site = type("Site", (core.Identifiable, core.Log, core.HasContainer), {})
+    site = Site(env=env, name="site", capacity=10, level=5)
+    inner = model.RepeatActivity(
+        env=env,
+        name="Inner repeat activity",
+        registry=registry,
+        sub_processes=[
+            model.BasicActivity(
+                env=env,
+                name="Basic activity",
+                registry=registry,
+                duration=1,
+                additional_logs=[site],
+            )
+        ],
+        repetitions=50,
+        fast_forward=True,
+    )
+    outer = model.RepeatActivity(
+        env=env,
+        name="Outer repeat activity",
+        registry=registry,
+        sub_processes=[inner],
+        repetitions=3,
+    )
+    register([outer])
+    env.run()
+
+    assert env.now == 150
+    # every run of the inner loop measures two cycles and simulates the last one
+    assert sum(skipped) == 3 * 47
+    assert site.container.level_ranges is None
@@ -0,0 +1,228 @@
+"""Test module for the log backends."""
+
+import datetime
+import functools
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+import shapely.geometry
+import simpy
+
+from openclsim import core, plot
+
+from .test_utils import assert_log
+
+
+def _write_entries(log):
+    log.log_entry(0, "activity", core.LogState.START)
+    log.log_entry(
+        10.5,
+        "activity",
+        core.LogState.WAIT_START,
+        activity_label={"type": "subprocess", "ref": "sub"},
+    )
+    log.log_entry(
+        12,
+        "activity",
+        core.LogState.WAIT_STOP,
+        activity_label={"type": "subprocess", "ref": "sub"},
+    )
+    log.log_entry(20, "other activity", core.LogState.STOP)
+
+
+def test_columnar_equals_dict_backend():
+    """Test that the columnar backend presents the same log as the dict backend."""
+    env = simpy.Environment()
+    Object = type("Object", (core.Identifiable, core.Log), {})
+
+    columnar = Object(env=env, name="columnar")
+    legacy = Object(env=env, name="legacy", log_backend=core.DictLogBackend)
+    assert isinstance(columnar.log_backend, core.ColumnarLogBackend)
+
+    _write_entries(columnar)
+    _write_entries(legacy)
+
+    assert columnar.log == legacy.log
+    assert len(columnar.log_backend) == 4
+    assert len(columnar.log_backend.id_table) == 2
+    assert len(columnar.log_backend.label_table) == 2
+
+    assert_log(columnar)
+    df = plot.get_log_dataframe(columnar)
+    assert list(df["ActivityState"]) == ["START", "WAIT_START", "WAIT_STOP", "STOP"]
+    assert list(df.columns) == ["Activity", "Timestamp", "ActivityState", "type", "ref"]
+    pd.testing.assert_frame_equal(df, plot.get_log_dataframe(legacy))
+
+
+def test_columnar_view_is_cached():
+    """Test that the dictionary view is only rebuilt after a new entry."""
+    env = simpy.Environment()
+    log = core.Log(env=env)
+
+    log.log_entry(0, "activity", core.LogState.START)
+    view = log.log
+    assert log.log is view
+
+    log.log_entry(1, "activity", core.LogState.STOP)
+    assert log.log is not view
+    assert log.log["ActivityState"] == ["START", "STOP"]
+
+
+@pytest.mark.parametrize("file_format", ["arrow", "parquet"])
+def test_streaming_backend(tmp_path, file_format):
+    """Test that the streaming backend writes the entries in batches."""
+    pytest.importorskip("pyarrow")
+
+    env = simpy.Environment()
+    Object = type("Object", (core.Identifiable, core.Log, core.Locatable), {})
+    path = tmp_path / f"log.{file_format}"
+    streaming = Object(
+        env=env,
+        name="streaming",
+        geometry=shapely.geometry.Point(4.2, 52.1),
+        log_backend=functools.partial(
+            core.StreamingLogBackend, path=path, batch_size=3, file_format=file_format
+        ),
+    )
+    columnar = Object(
+        env=env, name="columnar", geometry=shapely.geometry.Point(4.2, 52.1)
+    )
+
+    _write_entries(streaming)
+    _write_entries(columnar)
+
+    # only the complete batches are written, the rest is buffered
+    assert streaming.log_backend.nr_written == 3
+    assert len(streaming.log_backend) == 4
+    assert len(core.read_log(path)) == 3
+
+    log = streaming.log
+    assert log["Timestamp"] == columnar.log["Timestamp"]
+    assert log["ActivityID"] == columnar.log["ActivityID"]
+    assert log["ActivityState"] == columnar.log["ActivityState"]
+    assert log["ActivityLabel"] == columnar.log["ActivityLabel"]
+    assert log["ObjectState"][0]["geometry"] == {
+        "type": "Point",
+        "coordinates": [4.2, 52.1],
+    }
+    assert streaming.log_backend.entry(1)[2] == "WAIT_START"
+    assert streaming.log_backend.entry(3)[2] == "STOP"
+
+    with streaming.log_backend:
+        _write_entries(streaming)
+        # the entries of the earlier batches are read back from disk
+        assert streaming.log_backend.entry(1)[4] == {"type": "subprocess", "ref": "sub"}
+        assert streaming.log_backend.entry(-1)[2] == "STOP"
+        assert len(core.read_log(path)) == 7
+
+    # leaving the context writes the last, partial batch
+    batches = list(core.read_log_batches(path, columns=["ActivityState"]))
+    assert [len(batch) for batch in batches] == [3, 1, 3, 1]
+    assert list(batches[0].columns) == ["ActivityState"]
+
+    # a closed log can not be appended to, so its file is never truncated
+    with pytest.raises(ValueError):
+        streaming.log_entry(20, "activity", core.LogState.START)
+    streaming.log_backend.close()
+    assert len(streaming.log_backend) == 8
+    assert streaming.log["ActivityState"] == 2 * columnar.log["ActivityState"]
+
+
+def test_state_snapshots():
+    """Test that the object state is only captured again after it changed."""
+    env = simpy.Environment()
+    Site = type(
+        "Site",
+        (core.Identifiable, core.Log, core.Locatable, core.HasContainer),
+        {},
+    )
+    site = Site(
+        env=env,
+        name="site",
+        geometry=shapely.geometry.Point(4.2, 52.1),
+        capacity=10,
+        level=5,
+    )
+
+    site.log_entry(0, "activity", core.LogState.START)
+    site.log_entry(1, "activity", core.LogState.STOP)
+    states = site.log_backend.object_states
+    assert states[0] is states[1]
+
+    env.process(site.container.get(2))
+    env.run()
+    site.log_entry(2, "activity", core.LogState.START)
+    site.geometry = shapely.geometry.Point(4.3, 52.1)
+    site.log_entry(3, "activity", core.LogState.STOP)
+    assert len(site.log_backend.snapshots) == 3
+    assert [state["container level"] for state in site.log["ObjectState"]] == [
+        5,
+        5,
+        3,
+        3,
+    ]
+    assert site.log["ObjectState"][3]["geometry"].x == 4.3
+
+    # a component without a state version is captured for every entry
+    class Draught:
+        def get_state(self):
+            state = {}
+            if hasattr(super(), "get_state"):
+                state = super().get_state()
+            state.update({"draught": 4.5})
+            return state
+
+    Vessel = type("Vessel", (core.Identifiable, core.Log, Draught), {})
+    vessel = Vessel(env=env, name="vessel")
+    vessel.log_entry(0, "activity", core.LogState.START)
+    vessel.log_entry(1, "activity", core.LogState.STOP)
+    states = vessel.log_backend.object_states
+    assert states[0] is not states[1]
+    assert states[1] == {"draught": 4.5}
+
+
+def test_timestamps():
+    """Test that the numeric timestamps are converted like utcfromtimestamp."""
+    timestamps = np.array([0, 0.5, 1.0000005, 8727428.6752645, 1.6e9 + 0.25])
+    expected = [datetime.datetime.utcfromtimestamp(t) for t in timestamps.tolist()]
+    assert core.log_backend.to_datetime(timestamps).to_pydatetime().tolist() == (
+        expected
+    )
+
+    env = simpy.Environment()
+    for log_backend in [core.ColumnarLogBackend, core.DictLogBackend]:
+        log = core.Log(env=env, log_backend=log_backend)
+        for t in timestamps:
+            log.log_entry(t, "activity", core.LogState.START)
+
+        assert log.log["Timestamp"] == expected
+        np.testing.assert_allclose(
+            log.log_backend.get_timestamps(), timestamps, atol=1e-6
+        )
+
+
+def test_activity_label():
+    """Test that the activity label is an immutable mapping equal to its dict."""
+    label = core.ActivityLabel("subprocess", "id")
+    assert label == {"type": "subprocess", "ref": "id"}
+    assert dict(label) == {"type": "subprocess", "ref": "id"}
+    assert label["ref"] == label.ref == "id"
+    assert hash(label) == hash(core.ActivityLabel("subprocess", "id"))
+    assert pickle.loads(pickle.dumps(label)) == label
+
+    with pytest.raises(AttributeError):
+        label.ref = "other id"
+    with pytest.raises(KeyError):
+        label["other"]
+
+
+def test_log_backend_is_abstract():
+    """Test that a log backend has to implement the interface."""
+    with pytest.raises(TypeError):
+        core.LogBackend()
+
+    Incomplete = type("Incomplete", (core.LogBackend,), {"to_dict": lambda self: {}})
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -1,5 +1,7 @@
 """Test package."""
 
+import datetime
+
 import simpy
 
 import openclsim.model as model
@@ -57,3 +59,50 @@ def test_parallel():
     assert env.now == 220
     assert_log(activity)
     assert_log(reporting_activity)
+
+
+def test_parallel_many_sub_processes():
+    """Test that every sub process of a large parallel activity is logged once."""
+    env = simpy.Environment()
+    registry = {}
+
+    durations = [(i * 7) % 25 for i in range(150)]
+    sub_processes = [
+        model.BasicActivity(
+            env=env,
+            name=f"Barge activity {i}",
+            registry=registry,
+            duration=duration,
+        )
+        for i, duration in enumerate(durations)
+    ]
+
+    activity = model.ParallelActivity(
+        env=env,
+        name="Parallel process",
+        registry=registry,
+        sub_processes=sub_processes,
+    )
+
+    model.register_processes([activity])
+    env.run()
+
+    assert env.now == max(durations)
+
+    log = activity.log
+    stops = [
+        (t, label["ref"])
+        for t, state, label in zip(
+            log["Timestamp"], log["ActivityState"], log["ActivityLabel"]
+        )
+        if state == "STOP" and label
+    ]
+    assert len(stops) == len(sub_processes)
+
+    # the sub processes finishing at the same time are logged in their given order
+    order = {sub_process.id: i for i, sub_process in enumerate(sub_processes)}
+    expected = sorted((duration, i) for i, duration in enumerate(durations))
+    assert [(t, order[ref]) for t, ref in stops] == [
+        (datetime.datetime.utcfromtimestamp(duration), i) for duration, i in expected
+    ]
+    assert log["ActivityState"][-1] == "STOP"
@@ -1,5 +1,6 @@
 """Test package."""
 
+import pytest
 import simpy
 
 import openclsim.model as model
@@ -41,3 +42,51 @@ def test_process_synchronization():
     assert_log(act1)
     assert_log(act2)
     assert_log(reporting_activity)
+
+
+def test_registration_order():
+    """Test that the activities are registered after the activities they wait for."""
+    env = simpy.Environment()
+    registry = {}
+
+    first = model.BasicActivity(
+        env=env,
+        name="First",
+        registry=registry,
+        duration=1,
+        start_event={"type": "activity", "state": "done", "name": "Second"},
+    )
+    second = model.BasicActivity(env=env, name="Second", registry=registry, duration=2)
+    third = model.BasicActivity(env=env, name="Third", registry=registry, duration=3)
+
+    assert model.RegistrationPlan([first, second, third]).items == [
+        second,
+        first,
+        third,
+    ]
+
+    model.register_processes([first, second, third])
+    env.run()
+    assert env.now == 3
+    assert first.log["ActivityState"][-1] == "STOP"
+
+
+def test_registration_cycle():
+    """Test that a cycle in the start events names the activities involved."""
+    env = simpy.Environment()
+    registry = {}
+
+    activities = [
+        model.BasicActivity(
+            env=env,
+            name=name,
+            registry=registry,
+            duration=1,
+            start_event={"type": "activity", "state": "done", "name": other},
+        )
+        for name, other in [("A", "B"), ("B", "A")]
+    ]
+    independent = model.BasicActivity(env=env, name="C", registry=registry, duration=1)
+
+    with pytest.raises(ValueError, match="registered: A, B$"):
+        model.register_processes([independent, *activities])
@@ -33,3 +33,53 @@ def test_repeat_activity():
 
     assert my_env.now == 42
     assert_log(repeat_activity)
+
+
+def test_registration_plan():
+    """Test that the iterations only re-register the activities which have run."""
+    env = simpy.Environment()
+    registry = {}
+
+    basic_activities = [
+        model.BasicActivity(
+            env=env,
+            name=f"Basic activity {i}",
+            registry=registry,
+            duration=1,
+        )
+        for i in range(3)
+    ]
+    sequence = model.SequentialActivity(
+        env=env,
+        name="Sequential activity",
+        registry=registry,
+        sub_processes=basic_activities,
+    )
+    activity = model.RepeatActivity(
+        env=env,
+        name="Repeat activity",
+        registry=registry,
+        sub_processes=[sequence],
+        repetitions=4,
+    )
+
+    plan = activity.registration_plan
+    assert plan.items == [sequence, *basic_activities]
+
+    model.register_processes([activity])
+    env.run()
+
+    assert env.now == 12
+    assert len(sequence.log["ActivityState"]) == 4 * 8
+
+    # only the activities which have run get a new process
+    processes = [item.main_process for item in plan.items]
+    plan.rearm()
+    assert all(
+        item.main_process is not process for item, process in zip(plan.items, processes)
+    )
+    processes = [item.main_process for item in plan.items]
+    plan.rearm()
+    assert all(
+        item.main_process is process for item, process in zip(plan.items, processes)
+    )
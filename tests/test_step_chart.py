@@ -0,0 +1,72 @@
+"""Test module for the histories of the container levels."""
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import simpy
+
+from openclsim import core, plot
+
+matplotlib.use("Agg")
+
+
+def test_level_history():
+    """Test that the levels are extracted per container id and compacted."""
+    env = simpy.Environment()
+    Site = type("Site", (core.Identifiable, core.Log, core.HasMultiContainer), {})
+    site = Site(
+        env=env,
+        name="site",
+        store_capacity=2,
+        initials=[
+            {"id": "sand", "level": 10, "capacity": 10},
+            {"id": "stones", "level": 0, "capacity": 10},
+        ],
+    )
+
+    for t in range(5):
+        site.log_entry(t, "activity", core.LogState.START)
+        if t >= 2:
+            env.process(site.container.get(1, id_="sand"))
+            env.run()
+    site.log_entry(5, "activity", core.LogState.STOP)
+
+    history = plot.get_level_history(site, compact=False)
+    assert list(history) == ["sand", "stones"]
+    assert list(history["sand"]) == [10, 10, 10, 9, 8, 7]
+
+    history = plot.get_level_history(site)
+    assert list(history["sand"]) == [10, 10, 9, 8, 7]
+    assert list(history["stones"]) == [0, 0]
+    assert history["stones"].index[-1] == pd.Timestamp(1970, 1, 1, 0, 0, 5)
+
+    fig = plot.get_step_chart([site], width=2)
+    assert [line.get_label() for line in fig.axes[0].lines] == [
+        "site sand",
+        "site stones",
+    ]
+
+
+def test_downsample_levels():
+    """Test that the downsampled levels keep the extremes of every bucket."""
+    rng = np.random.default_rng(0)
+    index = pd.to_datetime(np.sort(rng.uniform(0, 1e6, 10_000)), unit="s")
+    levels = pd.Series(rng.normal(size=10_000).cumsum(), index=index)
+
+    downsampled = plot.downsample_levels(levels, width=100)
+    assert len(downsampled) <= 400
+    assert downsampled.index[0] == levels.index[0]
+    assert downsampled.index[-1] == levels.index[-1]
+
+    # the first, last, minimum and maximum of every pixel are kept
+    seconds = (levels.index - levels.index[0]).total_seconds()
+    pixels = np.minimum(seconds / seconds[-1] * 100, 99).astype(int)
+    kept = pd.Series(pixels, index=levels.index)[downsampled.index]
+    for pixel, in_pixel in levels.groupby(pixels):
+        kept_in_pixel = downsampled[kept.to_numpy() == pixel]
+        assert kept_in_pixel.index[0] == in_pixel.index[0]
+        assert kept_in_pixel.index[-1] == in_pixel.index[-1]
+        assert kept_in_pixel.max() == in_pixel.max()
+        assert kept_in_pixel.min() == in_pixel.min()
+
+    assert len(plot.downsample_levels(levels[:10], width=100)) == 10
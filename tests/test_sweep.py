@@ -0,0 +1,116 @@
+"""Test module for the parameter sweeps."""
+
+import pytest
+import simpy
+
+import openclsim.batch as batch
+import openclsim.model as model
+
+calls = []
+
+
+def build_scenario(nr_activities, duration):
+    """Build a sequence of basic activities."""
+    calls.append((nr_activities, duration))
+    env = simpy.Environment()
+    registry = {}
+
+    sub_processes = [
+        model.BasicActivity(
+            env=env,
+            name=f"Basic activity {i}",
+            registry=registry,
+            duration=duration,
+        )
+        for i in range(nr_activities)
+    ]
+    activity = model.SequentialActivity(
+        env=env,
+        name="Sequential activity",
+        registry=registry,
+        sub_processes=sub_processes,
+    )
+    model.register_processes([activity])
+    return env, [activity]
+
+
+def test_parameter_grid():
+    """Test the combinations and the hashes of a parameter grid."""
+    grid = batch.get_parameter_grid({"a": [1, 2], "b": ["x", "y", "z"]})
+    assert len(grid) == 6
+    assert grid[0] == {"a": 1, "b": "x"}
+    assert grid[-1] == {"a": 2, "b": "z"}
+
+    hashes = {batch.get_input_hash(build_scenario, point) for point in grid}
+    assert len(hashes) == 6
+    assert batch.get_input_hash(
+        build_scenario, {"b": "x", "a": 1}
+    ) == batch.get_input_hash(build_scenario, grid[0])
+
+    # the horizon and the summary function are part of the hash
+    assert batch.get_input_hash(
+        build_scenario, grid[0], until=100
+    ) != batch.get_input_hash(build_scenario, grid[0])
+    assert batch.get_input_hash(
+        build_scenario, grid[0], summarize=build_scenario
+    ) != batch.get_input_hash(build_scenario, grid[0])
+
+    with pytest.raises(TypeError):
+        batch.get_input_hash(build_scenario, {"a": object()})
+
+
+def test_run_sweep(tmp_path):
+    """Test that a sweep only runs the combinations which are not cached yet."""
+    progress = []
+
+    def report(done, total, throughput):
+        progress.append((done, total))
+        assert throughput > 0
+
+    calls.clear()
+    parameters = {"nr_activities": [1, 2], "duration": [10, 20]}
+    result = batch.run_sweep(
+        build_scenario, parameters, tmp_path, max_workers=1, progress=report
+    )
+
+    assert len(calls) == 4
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    assert list(result["SimulationTime"]) == [10, 20, 20, 40]
+    assert list(result["nr_activities"]) == [1, 1, 2, 2]
+    assert len(list(tmp_path.glob("*.pkl"))) == 4
+
+    # extending the sweep only runs the new combinations
+    calls.clear()
+    parameters["duration"].append(30)
+    result = batch.run_sweep(
+        build_scenario, parameters, tmp_path, max_workers=1, progress=None
+    )
+    assert sorted(calls) == [(1, 30), (2, 30)]
+    assert list(result["SimulationTime"]) == [10, 20, 30, 20, 40, 60]
+
+    # the new combinations are run in the process pool
+    parameters["nr_activities"].append(3)
+    result = batch.run_sweep(build_scenario, parameters, tmp_path, max_workers=2)
+    assert list(result["SimulationTime"])[-3:] == [30, 60, 90]
+    assert len(list(tmp_path.glob("*.pkl"))) == 9
+
+
+def test_failed_runs(tmp_path):
+    """Test that the other runs are stored when a run of the sweep fails."""
+    for max_workers in [1, 2]:
+        directory = tmp_path / str(max_workers)
+        # a negative duration raises when the scenario is run
+        parameters = {"nr_activities": [1], "duration": [10, -1, 20]}
+        with pytest.raises(RuntimeError, match="1 of 3 runs"):
+            batch.run_sweep(
+                build_scenario, parameters, directory, max_workers=max_workers
+            )
+        assert len(list(directory.glob("*.pkl"))) == 2
+
+        calls.clear()
+        parameters["duration"].remove(-1)
+        result = batch.run_sweep(
+            build_scenario, parameters, directory, max_workers=max_workers
+        )
+        assert calls == []
+        assert list(result["SimulationTime"]) == [10, 20]
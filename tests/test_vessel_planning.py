@@ -0,0 +1,41 @@
+"""Test module for the segments of the vessel planning."""
+
+import datetime
+
+import simpy
+
+from openclsim import core, plot
+
+
+def test_segment_table():
+    """Test that the START and STOP of every activity are paired per vessel."""
+    env = simpy.Environment()
+    Vessel = type("Vessel", (core.Identifiable, core.Log), {})
+    vessel = Vessel(env=env, name="vessel")
+    other = Vessel(env=env, name="other vessel")
+    idle = Vessel(env=env, name="idle vessel")
+
+    vessel.log_entry(0, "sailing", core.LogState.START)
+    vessel.log_entry(5, "loading", core.LogState.START)
+    vessel.log_entry(6, "loading", core.LogState.WAIT_START)
+    vessel.log_entry(7, "loading", core.LogState.WAIT_STOP)
+    vessel.log_entry(10, "sailing", core.LogState.STOP)
+    vessel.log_entry(12, "loading", core.LogState.STOP)
+    vessel.log_entry(20, "sailing", core.LogState.START)
+    vessel.log_entry(30, "sailing", core.LogState.STOP)
+    # a STOP without a START is left out
+    other.log_entry(1, "sailing", core.LogState.STOP)
+    other.log_entry(2, vessel.id, core.LogState.START)
+    other.log_entry(4, vessel.id, core.LogState.STOP)
+
+    df = plot.get_segment_table([vessel, other, idle], activities=[vessel])
+    assert list(df.columns) == ["Vessel", "Activity", "Start", "Stop"]
+    assert list(df["Vessel"]) == ["vessel"] * 3 + ["other vessel"]
+    assert list(df["Activity"]) == ["sailing", "loading", "sailing", "vessel"]
+
+    def seconds(column):
+        epoch = datetime.datetime(1970, 1, 1)
+        return [(t - epoch).total_seconds() for t in df[column]]
+
+    assert seconds("Start") == [0, 5, 20, 2]
+    assert seconds("Stop") == [10, 12, 30, 4]
@@ -1,10 +1,13 @@
 """Test application for the weather plugin."""
 
 import datetime
+import gc
+import weakref
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
+import pytest
 import shapely.geometry
 import simpy
 
@@ -15,7 +18,8 @@ import openclsim.plugins as plugin
 from .test_utils import assert_log
 
 
-def test_weather():
+@pytest.mark.parametrize("memory_mapped", [False, True])
+def test_weather(tmp_path, memory_mapped):
     """Test function for weather plugin."""
     simulation_start = datetime.datetime(2009, 1, 1)
     my_env = simpy.Environment(initial_time=simulation_start.timestamp())
@@ -108,6 +112,10 @@ def test_weather():
     metocean_df = metocean_df.sort_index()
     metocean_df["ts"] = metocean_df.index.values.astype(float) / 1_000_000_000
 
+    if memory_mapped:
+        plugin.write_metocean_npy(metocean_df, tmp_path, columns=["ts", "Hs [m]"])
+        metocean_df = plugin.read_metocean_npy(tmp_path)
+
     sailing_crit = plugin.WeatherCriterion(
         name="sailing_crit",
         condition="Hs [m]",
@@ -190,3 +198,166 @@ def test_weather():
 
     assert_log(hopper)
     assert_log(while_activity)
+
+
+def test_weather_window_index(monkeypatch):
+    """Test that the weather windows are computed once and searched correctly."""
+    ts = np.arange(0, 48 * 3600, 3600, dtype=float)
+    metocean_df = pd.DataFrame(
+        {"ts": ts, "Hs [m]": 2 + 1.5 * np.sin(ts / 86400 * 4 * np.pi)}
+    )
+    criterion = plugin.WeatherCriterion(
+        name="crit", condition="Hs [m]", maximum=2.5, window_length=3600
+    )
+    weather_plugin = plugin.weather.WeatherPluginActivity(
+        weather_criteria=criterion, metocean_df=metocean_df
+    )
+
+    windows = np.array(weather_plugin.process_data(criterion)["windows"])
+    calls = []
+    process_data = weather_plugin.process_data
+    monkeypatch.setattr(
+        weather_plugin,
+        "process_data",
+        lambda criterion: calls.append(criterion) or process_data(criterion),
+    )
+
+    for t in np.linspace(0, windows[-1, 1], 50):
+        expected = windows[windows[:, 1] >= t][0]
+        assert weather_plugin.check_constraint(start_time=t) == list(expected)
+
+    # after the last window the dataset is repeated
+    t = ts[-1] + windows[0, 1] / 2
+    assert weather_plugin.check_constraint(start_time=t) == list(windows[0])
+
+    assert len(calls) == 1
+
+
+def test_weather_window_store():
+    """Test that identical criteria on the same dataset share their windows."""
+    ts = np.arange(0, 48 * 3600, 3600, dtype=float)
+    metocean_df = pd.DataFrame(
+        {"ts": ts, "Hs [m]": 2 + 1.5 * np.sin(ts / 86400 * 4 * np.pi)}
+    )
+    store = plugin.WeatherWindowStore(maxsize=2)
+
+    def weather_plugin(maximum, df=metocean_df):
+        criterion = plugin.WeatherCriterion(
+            name="crit", condition="Hs [m]", maximum=maximum, window_length=3600
+        )
+        return plugin.weather.WeatherPluginActivity(
+            weather_criteria=criterion, metocean_df=df, store=store
+        )
+
+    first = weather_plugin(2.5)
+    second = weather_plugin(2.5)
+    assert first.window_index is second.window_index
+    assert (store.hits, store.misses, len(store)) == (1, 1, 1)
+
+    other = weather_plugin(3)
+    copy = weather_plugin(2.5, df=metocean_df.copy())
+    assert other.window_index is not first.window_index
+    assert copy.window_index is not first.window_index
+    assert (store.hits, store.misses, len(store)) == (1, 3, 2)
+
+    # the least recently used window index has been evicted
+    weather_plugin(2.5).window_index
+    assert (store.hits, store.misses, len(store)) == (1, 4, 2)
+
+    # the windows of a dataset are evicted when it is garbage collected
+    df = metocean_df.copy()
+    weather_plugin(3, df=df).window_index
+    assert len(store) == 2
+    dataset = weakref.ref(df)
+    del df
+    gc.collect()
+    assert dataset() is None
+    assert len(store) == 1
+
+    store.clear()
+    assert (store.hits, store.misses, len(store)) == (0, 0, 0)
+
+
+def test_intersect_windows():
+    """Test the intersection of the windows of multiple criteria."""
+    starts, ends = plugin.weather.intersect_windows(
+        [
+            (np.array([0.0, 10, 20, 40]), np.array([5.0, 15, 30, 50])),
+            (np.array([3.0, 15, 25]), np.array([12.0, 22, 45])),
+            (np.array([0.0]), np.array([100.0])),
+        ]
+    )
+    assert list(starts) == [3, 10, 15, 20, 25, 40]
+    assert list(ends) == [5, 12, 15, 22, 30, 45]
+
+
+def test_multiple_weather_criteria():
+    """Test that a plugin with multiple criteria only uses the common windows."""
+    ts = np.arange(0, 96 * 3600, 1800, dtype=float)
+    metocean_df = pd.DataFrame(
+        {
+            "ts": ts,
+            "Hs [m]": 2 + 1.5 * np.sin(ts / 86400 * 4 * np.pi),
+            "U [m/s]": 8 + 6 * np.cos(ts / 86400 * 3 * np.pi),
+        }
+    )
+    wave_crit = plugin.WeatherCriterion(
+        name="wave", condition="Hs [m]", maximum=2.5, window_length=3600
+    )
+    wind_crit = plugin.WeatherCriterion(
+        name="wind", condition="U [m/s]", maximum=10, window_length=1800
+    )
+
+    combined = plugin.weather.WeatherPluginActivity(
+        weather_criteria=[wave_crit, wind_crit], metocean_df=metocean_df
+    )
+    single = [
+        plugin.weather.WeatherPluginActivity(
+            weather_criteria=crit, metocean_df=metocean_df
+        )
+        for crit in [wave_crit, wind_crit]
+    ]
+
+    for t in np.linspace(0, ts[-1] / 2, 40):
+        start, end = combined.check_constraint(start_time=t)
+        assert start <= end and end >= t
+        for weather_plugin in single:
+            starts, ends, _ = weather_plugin.window_index
+            assert np.any((starts <= max(start, t)) & (ends >= max(start, t)))
+
+
+def test_memory_mapped_metocean_data(tmp_path):
+    """Test the weather windows of memory-mapped metocean data."""
+    ts = np.arange(0, 48 * 3600, 3600, dtype=float)
+    metocean_df = pd.DataFrame(
+        {"ts": ts, "U [m/s]": 8 + 6 * np.sin(ts / 86400 * 4 * np.pi)}
+    )
+    criterion = plugin.WeatherCriterion(
+        name="crit", condition="U [m/s]", maximum=10, window_length=3600
+    )
+
+    plugin.write_metocean_npy(metocean_df, tmp_path)
+    metocean_data = plugin.read_metocean_npy(tmp_path)
+    assert sorted(metocean_data) == ["U [m/s]", "ts"]
+    assert all(isinstance(data, np.memmap) for data in metocean_data.values())
+
+    from_memmap = plugin.weather.WeatherPluginActivity(
+        weather_criteria=criterion, metocean_df=metocean_data
+    )
+    from_df = plugin.weather.WeatherPluginActivity(
+        weather_criteria=criterion, metocean_df=metocean_df
+    )
+    assert np.array_equal(
+        from_memmap.process_data(criterion)["windows"],
+        from_df.process_data(criterion)["windows"],
+    )
+
+    # the windows are stored per dataset, also for a plain dict of arrays
+    from_dict = plugin.weather.WeatherPluginActivity(
+        weather_criteria=criterion, metocean_df=dict(metocean_data)
+    )
+    for weather_plugin in [from_memmap, from_dict]:
+        for expected, actual in zip(from_df.window_index, weather_plugin.window_index):
+            assert np.array_equal(expected, actual)
+        for t in [0.0, 100.0, 7 * 3600.0, 30 * 3600.0]:
+            assert weather_plugin.check_constraint(t) == from_df.check_constraint(t)